@@ -0,0 +1,94 @@
+"""add_job_postings_source_external_id_unique
+
+Revision ID: 8c3e1f7a9b2d
+Revises: 5211f05a3bd6
+Create Date: 2026-10-15 09:12:31.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3e1f7a9b2d'
+down_revision = '5211f05a3bd6'
+branch_labels = None
+depends_on = None
+
+# Marks the constraint as created here, so downgrade leaves one made by create_all alone
+CONSTRAINT_COMMENT = f'created by alembic revision {revision}'
+
+# Column that identifies an equivalent row in tables referencing job_postings;
+# a duplicate's row moves to the kept posting only if that has no such row yet
+DEPENDENT_ROW_KEYS = {
+    'job_skills': 'skill_id',
+    'job_matches': 'user_id',
+}
+
+
+def upgrade() -> None:
+    # Unique (source, external_id) lets bulk loads use ON CONFLICT DO NOTHING
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {c['name'] for c in inspector.get_unique_constraints('job_postings')}
+    if 'uq_source_external_id' in existing:
+        return
+
+    # Merge duplicate postings into the oldest row of each (source, external_id)
+    op.execute("""
+        CREATE TEMP TABLE job_posting_duplicates ON COMMIT DROP AS
+        SELECT id, keep_id FROM (
+            SELECT id, MIN(id) OVER (PARTITION BY source, external_id) AS keep_id
+            FROM job_postings
+            WHERE external_id IS NOT NULL
+        ) ranked
+        WHERE id <> keep_id
+    """)
+
+    # Handle references that would otherwise block the delete; CASCADE and
+    # SET NULL foreign keys are left to the database. Rows the kept posting
+    # doesn't already have are moved to it, the rest are deleted.
+    for table in inspector.get_table_names():
+        for fk in inspector.get_foreign_keys(table):
+            ondelete = (fk.get('options', {}).get('ondelete') or '').upper()
+            if fk['referred_table'] != 'job_postings' or ondelete in ('CASCADE', 'SET NULL'):
+                continue
+            column = fk['constrained_columns'][0]
+            key = DEPENDENT_ROW_KEYS.get(table)
+            if key:
+                op.execute(f"""
+                    UPDATE {table} SET {column} = d.keep_id
+                    FROM job_posting_duplicates d
+                    WHERE {table}.{column} = d.id
+                      AND NOT EXISTS (
+                          SELECT 1 FROM {table} kept
+                          WHERE kept.{column} = d.keep_id AND kept.{key} = {table}.{key}
+                      )
+                      -- Several duplicates may share a row; move only the first
+                      AND {table}.id = (
+                          SELECT MIN(other.id)
+                          FROM {table} other
+                          JOIN job_posting_duplicates od ON other.{column} = od.id
+                          WHERE od.keep_id = d.keep_id AND other.{key} = {table}.{key}
+                      )
+                """)
+            op.execute(f"""
+                DELETE FROM {table}
+                WHERE {column} IN (SELECT id FROM job_posting_duplicates)
+            """)
+
+    op.execute("DELETE FROM job_postings WHERE id IN (SELECT id FROM job_posting_duplicates)")
+
+    op.create_unique_constraint('uq_source_external_id', 'job_postings', ['source', 'external_id'])
+    op.execute(f"COMMENT ON CONSTRAINT uq_source_external_id ON job_postings IS '{CONSTRAINT_COMMENT}'")
+
+
+def downgrade() -> None:
+    created_here = op.get_bind().execute(sa.text("""
+        SELECT obj_description(oid, 'pg_constraint') = :comment
+        FROM pg_constraint
+        WHERE conname = 'uq_source_external_id' AND conrelid = 'job_postings'::regclass
+    """), {'comment': CONSTRAINT_COMMENT}).scalar()
+
+    if created_here:
+        op.drop_constraint('uq_source_external_id', 'job_postings', type_='unique')
@@ -30,22 +30,20 @@ def init_db():
                 description="Communication, leadership, and interpersonal skills"
             )
             
-            db.add(technical_category)
-            db.add(soft_category)
-            db.commit()
+            db.add_all([technical_category, soft_category])
+            # Flush to get the category ids without ending the transaction
+            db.flush()
             
             sample_skills = [
-                Skill(name="Python", skill_type=SkillType.TECHNICAL, category_id=1),
-                Skill(name="JavaScript", skill_type=SkillType.TECHNICAL, category_id=1),
-                Skill(name="React", skill_type=SkillType.TECHNICAL, category_id=1),
-                Skill(name="SQL", skill_type=SkillType.TECHNICAL, category_id=1),
-                Skill(name="Communication", skill_type=SkillType.SOFT, category_id=2),
-                Skill(name="Leadership", skill_type=SkillType.SOFT, category_id=2),
+                Skill(name="Python", skill_type=SkillType.TECHNICAL, category_id=technical_category.id),
+                Skill(name="JavaScript", skill_type=SkillType.TECHNICAL, category_id=technical_category.id),
+                Skill(name="React", skill_type=SkillType.TECHNICAL, category_id=technical_category.id),
+                Skill(name="SQL", skill_type=SkillType.TECHNICAL, category_id=technical_category.id),
+                Skill(name="Communication", skill_type=SkillType.SOFT, category_id=soft_category.id),
+                Skill(name="Leadership", skill_type=SkillType.SOFT, category_id=soft_category.id),
             ]
             
-            for skill in sample_skills:
-                db.add(skill)
-            
+            db.bulk_save_objects(sample_skills)
             db.commit()
             print("Database initialized successfully!")
         else:
@@ -9,127 +9,147 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 import logging
-import requests
-import time
-from datetime import datetime, timedelta
+import asyncio
+import httpx
+import orjson
+from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional
 import argparse
 
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 from src.db.database import SessionLocal
 from src.schemas.ingestion import JobDTO
 from src.models.job import JobPosting
 from src.models.skill import Skill, JobSkill
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.rate_limiter import ADZUNA_REQUESTS_PER_MINUTE, AsyncTokenBucket
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Batches at least this large are loaded with COPY instead of a multi-row INSERT
+COPY_THRESHOLD = 100
+
+JOB_POSTING_COPY_COLUMNS = (
+    "external_id", "source", "title", "company", "location", "description",
+    "requirements", "salary_min", "salary_max", "job_type", "experience_level",
+    "category", "posted_date", "is_active", "raw_data",
+)
+
+# Search plan covering ALL Adzuna categories: (category, queries, pages_per_query)
+CATEGORY_SEARCHES = (
+    # IT Jobs (it-jobs) - 30%
+    ("it-jobs", ("software engineer", "data scientist", "web developer", "python developer", "devops"), 4),
+
+    # Healthcare & Nursing Jobs (healthcare-nursing-jobs) - 20%
+    ("healthcare-nursing-jobs", ("nurse", "registered nurse", "medical assistant", "physician", "therapist"), 3),
+
+    # Teaching Jobs (teaching-jobs) - 15%
+    ("teaching-jobs", ("teacher", "professor", "instructor", "tutor", "educator"), 3),
+
+    # Sales Jobs (sales-jobs) - 10%
+    ("sales-jobs", ("sales representative", "account manager", "sales manager", "business development"), 2),
+
+    # Accounting & Finance Jobs (accounting-finance-jobs) - 8%
+    ("accounting-finance-jobs", ("accountant", "financial analyst", "bookkeeper", "finance manager"), 2),
+
+    # Customer Services Jobs (customer-services-jobs) - 5%
+    ("customer-services-jobs", ("customer service", "call center", "customer support"), 2),
+
+    # Engineering Jobs (engineering-jobs) - 5%
+    ("engineering-jobs", ("mechanical engineer", "civil engineer", "electrical engineer"), 2),
+
+    # Admin Jobs (admin-jobs) - 3%
+    ("admin-jobs", ("administrative assistant", "receptionist", "office manager"), 1),
+
+    # Creative & Design Jobs (creative-design-jobs) - 2%
+    ("creative-design-jobs", ("graphic designer", "ui designer", "marketing coordinator"), 1),
+
+    # HR & Recruitment Jobs (hr-jobs) - 2%
+    ("hr-jobs", ("hr manager", "recruiter", "human resources"), 1),
+
+    # Additional categories for full coverage
+    ("legal-jobs", ("legal assistant", "paralegal"), 1),
+    ("logistics-warehouse-jobs", ("warehouse", "logistics", "supply chain"), 1),
+    ("pr-advertising-marketing-jobs", ("marketing manager", "digital marketing"), 1),
+    ("retail-jobs", ("retail manager", "store manager"), 1),
+    ("hospitality-catering-jobs", ("restaurant manager", "chef"), 1),
+    ("consultancy-jobs", ("consultant", "business analyst"), 1),
+    ("manufacturing-jobs", ("manufacturing", "production"), 1),
+    ("scientific-qa-jobs", ("scientist", "researcher"), 1),
+    ("social-work-jobs", ("social worker", "counselor"), 1),
+    ("travel-jobs", ("travel agent", "tourism"), 1),
+    ("energy-oil-gas-jobs", ("oil", "gas", "energy"), 1),
+    ("property-jobs", ("real estate", "property"), 1),
+    ("charity-voluntary-jobs", ("volunteer", "nonprofit"), 1),
+    ("domestic-help-cleaning-jobs", ("cleaner", "housekeeper"), 1),
+    ("maintenance-jobs", ("maintenance", "technician"), 1),
+    ("part-time-jobs", ("part time", "flexible"), 1),
+)
+
+# Adzuna fields kept in raw_data; everything else is already stored in columns
+RAW_DATA_FIELDS = ("redirect_url", "adref", "category")
+
+# Queries run concurrently but share one ADZUNA_REQUESTS_PER_MINUTE bucket
+MAX_CONCURRENT_REQUESTS = 8
+
+
+# spaCy batching for SkillNER extraction
+SKILLNER_BATCH_SIZE = 64
+# Each extra process loads its own spaCy model (~1 GB for en_core_web_lg)
+SKILLNER_PROCESSES = 1
+EMSI_INSERT_BATCH_SIZE = 1000
+MIN_SKILLNER_TEXT_LENGTH = 50
+
+# Built once at import and reused for every executemany batch
+EMSI_SKILL_INSERT = text("""
+    INSERT INTO job_skills_emsi 
+    (job_id, emsi_skill_id, skill_name, extraction_method, confidence, importance, is_required)
+    VALUES (:job_id, :emsi_skill_id, :skill_name, :extraction_method, :confidence, :importance, :is_required)
+    ON CONFLICT (job_id, emsi_skill_id) DO NOTHING
+""")
+
+
+class PreParsedNLP:
+    """Stands in for the spaCy pipeline inside SkillNER.
+
+    SkillNER parses its cleaned text with nlp(text); returning the doc
+    already produced by nlp.pipe avoids parsing every job a second time.
+    """
+    
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self.doc = None
+    
+    def __call__(self, text: str):
+        if self.doc is not None and self.doc.text == text:
+            return self.doc
+        return self.nlp(text)
+    
+    def __getattr__(self, name):
+        return getattr(self.nlp, name)
+
 
 class DailyJobScraper:
-    def __init__(self, days_back: int = 1):
+    def __init__(self, days_back: int = 1, skillner_processes: int = SKILLNER_PROCESSES):
         self.app_id = os.getenv("ADZUNA_APP_ID", "26919585")
         self.app_key = os.getenv("ADZUNA_APP_KEY", "f074f4e377cd49d55a8fc7bd6d4864b9")
         self.base_url = "https://api.adzuna.com/v1/api"
         self.country = "us"
         self.days_back = days_back
         
-        # Calculate date filter for new jobs
-        self.since_date = datetime.now() - timedelta(days=days_back)
+        # Calculate date filter for new jobs, in Adzuna's "created" format so
+        # ISO-8601 timestamps can be compared as strings
+        self.since_date = datetime.now(timezone.utc) - timedelta(days=days_back)
+        self.since_iso = self.since_date.strftime("%Y-%m-%dT%H:%M:%SZ")
         self.max_age = days_back  # Adzuna API parameter
+        self.skillner_processes = skillner_processes
+        self._skill_id_cache: Dict[str, int] = {}
     
-    def get_all_category_searches(self) -> List[Dict]:
-        """Get comprehensive search queries for ALL Adzuna categories"""
-        return [
-            # IT Jobs (it-jobs) - 30%
-            {"queries": ["software engineer", "data scientist", "web developer", "python developer", "devops"], 
-             "category": "it-jobs", "pages_per_query": 4},
-            
-            # Healthcare & Nursing Jobs (healthcare-nursing-jobs) - 20%
-            {"queries": ["nurse", "registered nurse", "medical assistant", "physician", "therapist"], 
-             "category": "healthcare-nursing-jobs", "pages_per_query": 3},
-            
-            # Teaching Jobs (teaching-jobs) - 15%
-            {"queries": ["teacher", "professor", "instructor", "tutor", "educator"], 
-             "category": "teaching-jobs", "pages_per_query": 3},
-            
-            # Sales Jobs (sales-jobs) - 10%
-            {"queries": ["sales representative", "account manager", "sales manager", "business development"], 
-             "category": "sales-jobs", "pages_per_query": 2},
-            
-            # Accounting & Finance Jobs (accounting-finance-jobs) - 8%
-            {"queries": ["accountant", "financial analyst", "bookkeeper", "finance manager"], 
-             "category": "accounting-finance-jobs", "pages_per_query": 2},
-            
-            # Customer Services Jobs (customer-services-jobs) - 5%
-            {"queries": ["customer service", "call center", "customer support"], 
-             "category": "customer-services-jobs", "pages_per_query": 2},
-            
-            # Engineering Jobs (engineering-jobs) - 5%
-            {"queries": ["mechanical engineer", "civil engineer", "electrical engineer"], 
-             "category": "engineering-jobs", "pages_per_query": 2},
-            
-            # Admin Jobs (admin-jobs) - 3%
-            {"queries": ["administrative assistant", "receptionist", "office manager"], 
-             "category": "admin-jobs", "pages_per_query": 1},
-            
-            # Creative & Design Jobs (creative-design-jobs) - 2%
-            {"queries": ["graphic designer", "ui designer", "marketing coordinator"], 
-             "category": "creative-design-jobs", "pages_per_query": 1},
-            
-            # HR & Recruitment Jobs (hr-jobs) - 2%
-            {"queries": ["hr manager", "recruiter", "human resources"], 
-             "category": "hr-jobs", "pages_per_query": 1},
-            
-            # Additional categories for full coverage
-            {"queries": ["legal assistant", "paralegal"], 
-             "category": "legal-jobs", "pages_per_query": 1},
-            
-            {"queries": ["warehouse", "logistics", "supply chain"], 
-             "category": "logistics-warehouse-jobs", "pages_per_query": 1},
-            
-            {"queries": ["marketing manager", "digital marketing"], 
-             "category": "pr-advertising-marketing-jobs", "pages_per_query": 1},
-            
-            {"queries": ["retail manager", "store manager"], 
-             "category": "retail-jobs", "pages_per_query": 1},
-            
-            {"queries": ["restaurant manager", "chef"], 
-             "category": "hospitality-catering-jobs", "pages_per_query": 1},
-            
-            {"queries": ["consultant", "business analyst"], 
-             "category": "consultancy-jobs", "pages_per_query": 1},
-            
-            {"queries": ["manufacturing", "production"], 
-             "category": "manufacturing-jobs", "pages_per_query": 1},
-            
-            {"queries": ["scientist", "researcher"], 
-             "category": "scientific-qa-jobs", "pages_per_query": 1},
-            
-            {"queries": ["social worker", "counselor"], 
-             "category": "social-work-jobs", "pages_per_query": 1},
-            
-            {"queries": ["travel agent", "tourism"], 
-             "category": "travel-jobs", "pages_per_query": 1},
-            
-            {"queries": ["oil", "gas", "energy"], 
-             "category": "energy-oil-gas-jobs", "pages_per_query": 1},
-            
-            {"queries": ["real estate", "property"], 
-             "category": "property-jobs", "pages_per_query": 1},
-            
-            {"queries": ["volunteer", "nonprofit"], 
-             "category": "charity-voluntary-jobs", "pages_per_query": 1},
-            
-            {"queries": ["cleaner", "housekeeper"], 
-             "category": "domestic-help-cleaning-jobs", "pages_per_query": 1},
-            
-            {"queries": ["maintenance", "technician"], 
-             "category": "maintenance-jobs", "pages_per_query": 1},
-            
-            {"queries": ["part time", "flexible"], 
-             "category": "part-time-jobs", "pages_per_query": 1},
-        ]
-    
-    def fetch_jobs_page(self, page: int, query: str = "", category: str = None) -> List[Dict]:
+    async def fetch_jobs_page(self, client: httpx.AsyncClient, page: int, query: str = "",
+                              category: str = None) -> List[Dict]:
         """Fetch a single page of jobs from Adzuna API with date filtering"""
         url = f"{self.base_url}/jobs/{self.country}/search/{page}"
         
@@ -146,34 +166,57 @@ class DailyJobScraper:
         if category:
             params["category"] = category
         
+        await self.rate_limiter.acquire()
+        
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await client.get(url, params=params)
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             jobs = data.get("results", [])
             
-            # Additional date filtering on our side
-            filtered_jobs = []
-            for job in jobs:
-                if job.get("created"):
-                    try:
-                        job_date = datetime.fromisoformat(job["created"].replace('Z', '+00:00'))
-                        if job_date >= self.since_date:
-                            filtered_jobs.append(job)
-                    except:
-                        # Include job if date parsing fails
-                        filtered_jobs.append(job)
-                else:
-                    # Include job if no date info
-                    filtered_jobs.append(job)
-            
-            return filtered_jobs
-            
-        except requests.exceptions.RequestException as e:
+            # Additional date filtering on our side; include jobs with no date info
+            since_iso = self.since_iso
+            return [
+                job for job in jobs
+                if not job.get("created") or job["created"] >= since_iso
+            ]
+            
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching page {page} for '{query}' in {category}: {e}")
             return []
     
+    async def fetch_query_pages(self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore,
+                                query: str, category: str, pages_per_query: int) -> List[List[Dict]]:
+        """Fetch pages for one query in order, stopping at the first empty page"""
+        pages = []
+        async with semaphore:
+            for page in range(1, pages_per_query + 1):
+                jobs = await self.fetch_jobs_page(client, page, query, category)
+                if not jobs:
+                    break
+                pages.append(jobs)
+        return pages
+    
+    async def fetch_all_pages(self, plan: List[tuple]) -> List[List[List[Dict]]]:
+        """Fetch every (category, query, pages_per_query) entry concurrently"""
+        self.rate_limiter = AsyncTokenBucket(ADZUNA_REQUESTS_PER_MINUTE, per=60, capacity=1)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        # One pooled transport so every page reuses kept-alive TLS connections
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_REQUESTS,
+                max_keepalive_connections=MAX_CONCURRENT_REQUESTS,
+            ),
+            retries=3,
+        )
+        
+        async with httpx.AsyncClient(transport=transport, timeout=30) as client:
+            return await asyncio.gather(*[
+                self.fetch_query_pages(client, semaphore, query, category, pages_per_query)
+                for category, query, pages_per_query in plan
+            ])
+    
     def convert_to_job_dto(self, job_data: Dict) -> Optional[JobDTO]:
         """Convert Adzuna job data to JobDTO"""
         try:
@@ -232,7 +275,7 @@ class DailyJobScraper:
                 category=category,
                 posted_date=posted_date,
                 extracted_skills=[],
-                raw_data=job_data
+                raw_data={key: job_data[key] for key in RAW_DATA_FIELDS if key in job_data}
             )
             
         except Exception as e:
@@ -243,58 +286,53 @@ class DailyJobScraper:
         """Scrape new jobs from all categories"""
         all_jobs = []
         seen_job_ids = set()
-        category_searches = self.get_all_category_searches()
         category_stats = {}
         
         logger.info(f"🚀 Starting daily job scrape for last {self.days_back} day(s)")
         logger.info(f"📅 Fetching jobs since: {self.since_date.strftime('%Y-%m-%d %H:%M')}")
-        logger.info(f"🏷️  Covering {len(category_searches)} job categories")
+        logger.info(f"🏷️  Covering {len(CATEGORY_SEARCHES)} job categories")
         
-        total_search_groups = len(category_searches)
+        plan = [
+            (category, query, pages_per_query)
+            for category, queries, pages_per_query in CATEGORY_SEARCHES
+            for query in queries
+        ]
         
-        for group_idx, search_group in enumerate(category_searches, 1):
-            category = search_group["category"]
-            queries = search_group["queries"]
-            pages_per_query = search_group["pages_per_query"]
-            
-            logger.info(f"[{group_idx}/{total_search_groups}] Processing {category}")
-            
-            for query in queries:
-                logger.info(f"  Searching: '{query}' (up to {pages_per_query} pages)")
-                query_jobs = 0
-                
-                for page in range(1, pages_per_query + 1):
-                    jobs = self.fetch_jobs_page(page, query, category)
+        logger.info(f"Fetching {len(plan)} queries with up to {MAX_CONCURRENT_REQUESTS} in flight")
+        plan_results = asyncio.run(self.fetch_all_pages(plan))
+        
+        for (category, query, pages_per_query), pages in zip(plan, plan_results):
+            logger.info(f"[{category}] Searched: '{query}' (up to {pages_per_query} pages)")
+            query_jobs = 0
+            
+            for page, jobs in enumerate(pages, 1):
+                page_added = 0
+                for job_data in jobs:
+                    # Adzuna ids are numeric strings; ints hash faster and take less memory
+                    job_id = job_data.get("id", "")
+                    if isinstance(job_id, str) and job_id.isdigit():
+                        job_id = int(job_id)
                     
-                    if not jobs:
-                        logger.info(f"    Page {page}: No new jobs found")
-                        break
+                    if job_id in seen_job_ids:
+                        continue
                     
-                    page_added = 0
-                    for job_data in jobs:
-                        job_id = str(job_data.get("id", ""))
-                        
-                        if job_id in seen_job_ids:
-                            continue
+                    seen_job_ids.add(job_id)
+                    job_dto = self.convert_to_job_dto(job_data)
+                    if job_dto:
+                        all_jobs.append(job_dto)
+                        query_jobs += 1
+                        page_added += 1
                         
-                        seen_job_ids.add(job_id)
-                        job_dto = self.convert_to_job_dto(job_data)
-                        if job_dto:
-                            all_jobs.append(job_dto)
-                            query_jobs += 1
-                            page_added += 1
-                            
-                            # Track category stats
-                            cat = job_dto.category or "Unknown"
-                            category_stats[cat] = category_stats.get(cat, 0) + 1
-                    
-                    logger.info(f"    Page {page}: Added {page_added} new jobs")
-                    
-                    # Rate limiting
-                    time.sleep(1.5)
+                        # Track category stats
+                        cat = job_dto.category or "Unknown"
+                        category_stats[cat] = category_stats.get(cat, 0) + 1
                 
-                logger.info(f"  Query '{query}': {query_jobs} new jobs")
-                time.sleep(2)  # Pause between queries
+                logger.info(f"    Page {page}: Added {page_added} new jobs")
+            
+            if len(pages) < pages_per_query:
+                logger.info(f"    Page {len(pages) + 1}: No new jobs found")
+            
+            logger.info(f"  Query '{query}': {query_jobs} new jobs")
         
         # Show results
         logger.info(f"\n📊 DAILY SCRAPE RESULTS:")
@@ -308,8 +346,13 @@ class DailyJobScraper:
         
         return all_jobs
     
-    def save_to_database(self, jobs: List[JobDTO], mode: str = "append") -> int:
-        """Save jobs to database WITH SIMPLE SKILL EXTRACTION"""
+    def save_to_database(self, jobs: List[JobDTO], mode: str = "append", reindex: bool = False) -> int:
+        """Save jobs to database WITH SIMPLE SKILL EXTRACTION
+        
+        With reindex=True in replace mode, ix_job_postings_category is dropped
+        before the load and rebuilt once afterwards. Only use it when no
+        other writers are active.
+        """
         if not jobs:
             logger.info("No jobs to save")
             return 0
@@ -320,68 +363,61 @@ class DailyJobScraper:
         try:
             if mode == "replace":
                 # Clear existing daily jobs
-                existing_count = db.query(JobPosting).filter(
-                    JobPosting.source == "adzuna_daily"
-                ).count()
+                has_existing = db.query(
+                    db.query(JobPosting).filter(JobPosting.source == "adzuna_daily").exists()
+                ).scalar()
                 
-                if existing_count > 0:
-                    # Delete related job_skills first
-                    existing_jobs = db.query(JobPosting).filter(
-                        JobPosting.source == "adzuna_daily"
-                    ).all()
+                if has_existing:
+                    # Delete related job_skills first, in one statement
+                    db.execute(text("""
+                        DELETE FROM job_skills
+                        WHERE job_id IN (SELECT id FROM job_postings WHERE source = :source)
+                    """), {"source": "adzuna_daily"})
                     
-                    for job in existing_jobs:
-                        db.query(JobSkill).filter(JobSkill.job_id == job.id).delete()
-                    
-                    db.query(JobPosting).filter(
+                    cleared_count = db.query(JobPosting).filter(
                         JobPosting.source == "adzuna_daily"
                     ).delete()
                     
                     db.commit()
-                    logger.info(f"Cleared {existing_count} existing daily jobs")
+                    logger.info(f"Cleared {cleared_count} existing daily jobs")
+            
+            rebuild_index = reindex and mode == "replace"
+            if rebuild_index:
+                db.execute(text("DROP INDEX IF EXISTS ix_job_postings_category"))
+                db.commit()
+                logger.info("Dropped ix_job_postings_category for bulk load")
             
             # Step 1: Save basic job data first
             logger.info("Step 1: Saving basic job data...")
-            batch_size = 100
+            batch_size = 1000
+            # COPY goes through psycopg 3's cursor.copy(); other drivers insert
+            use_copy = db.get_bind().dialect.driver == "psycopg"
             
-            for i in range(0, len(jobs), batch_size):
-                batch = jobs[i:i + batch_size]
-                
-                for job_dto in batch:
-                    try:
-                        # Check if job already exists
-                        existing = db.query(JobPosting).filter(
-                            JobPosting.external_id == job_dto.external_id,
-                            JobPosting.source == job_dto.source
-                        ).first()
-                        
-                        if existing:
-                            logger.debug(f"Skipping duplicate job: {job_dto.external_id}")
-                            continue
-                        
-                        job = JobPosting(
-                            external_id=job_dto.external_id,
-                            source=job_dto.source,
-                            title=job_dto.title,
-                            company=job_dto.company,
-                            location=job_dto.location,
-                            description=job_dto.description,
-                            salary_min=job_dto.salary_min,
-                            salary_max=job_dto.salary_max,
-                            job_type=job_dto.job_type,
-                            category=job_dto.category,
-                            posted_date=job_dto.posted_date,
-                            raw_data=job_dto.raw_data
-                        )
-                        db.add(job)
-                        success_count += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Error adding job {job_dto.external_id}: {e}")
-                        continue
-                
-                db.commit()
-                logger.info(f"  Saved batch {i//batch_size + 1}, total saved: {success_count}")
+            try:
+                for i in range(0, len(jobs), batch_size):
+                    batch = jobs[i:i + batch_size]
+                    rows = [job_dto.model_dump(exclude={"extracted_skills"}) for job_dto in batch]
+                    
+                    # Duplicates are skipped server-side via ON CONFLICT (source, external_id)
+                    if use_copy and len(rows) >= COPY_THRESHOLD:
+                        inserted = self._copy_job_postings(db, rows)
+                    else:
+                        inserted = self._insert_job_postings(db, rows)
+                    db.commit()
+                    
+                    if inserted < len(rows):
+                        logger.debug(f"Skipped {len(rows) - inserted} duplicate jobs")
+                    
+                    success_count += inserted
+                    logger.info(f"  Saved batch {i//batch_size + 1}, total saved: {success_count}")
+            finally:
+                if rebuild_index:
+                    db.rollback()
+                    db.execute(text(
+                        "CREATE INDEX IF NOT EXISTS ix_job_postings_category ON job_postings (category)"
+                    ))
+                    db.commit()
+                    logger.info("Rebuilt ix_job_postings_category")
             
             # Step 2: Extract skills from saved jobs
             if success_count > 0:
@@ -399,6 +435,50 @@ class DailyJobScraper:
             db.close()
     
 
+    def _insert_job_postings(self, db, rows: List[Dict]) -> int:
+        """Insert job rows in one statement, skipping existing (source, external_id)"""
+        if db.get_bind().dialect.name != "postgresql":
+            # No ON CONFLICT here, so look up which jobs already exist first
+            existing_ids = {
+                external_id for (external_id,) in db.query(JobPosting.external_id).filter(
+                    JobPosting.source == "adzuna_daily",
+                    JobPosting.external_id.in_([row["external_id"] for row in rows])
+                )
+            }
+            new_rows = [row for row in rows if row["external_id"] not in existing_ids]
+            db.bulk_insert_mappings(JobPosting, new_rows)
+            return len(new_rows)
+        
+        stmt = pg_insert(JobPosting).values(rows).on_conflict_do_nothing(
+            index_elements=["source", "external_id"]
+        )
+        return db.execute(stmt).rowcount
+    
+    def _copy_job_postings(self, db, rows: List[Dict]) -> int:
+        """Stream job rows through a COPY staging table, skipping existing jobs"""
+        columns = ", ".join(JOB_POSTING_COPY_COLUMNS)
+        # Only the copied columns, and no defaults, so staging rows don't
+        # draw values from job_postings_id_seq
+        db.execute(text(
+            "CREATE TEMP TABLE IF NOT EXISTS job_postings_staging ON COMMIT DELETE ROWS AS "
+            f"SELECT {columns} FROM job_postings WITH NO DATA"
+        ))
+        cursor = db.connection().connection.cursor()
+        
+        with cursor.copy(f"COPY job_postings_staging ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                row["is_active"] = 1
+                if row["raw_data"] is not None:
+                    row["raw_data"] = orjson.dumps(row["raw_data"]).decode()
+                copy.write_row([row[column] for column in JOB_POSTING_COPY_COLUMNS])
+        
+        result = db.execute(text(f"""
+            INSERT INTO job_postings ({columns})
+            SELECT {columns} FROM job_postings_staging
+            ON CONFLICT (source, external_id) DO NOTHING
+        """))
+        return result.rowcount
+    
     def _extract_skills_skillner(self, db):
         """Extract skills using direct SkillNER with EMSI database"""
         try:
@@ -406,7 +486,7 @@ class DailyJobScraper:
             from spacy.matcher import PhraseMatcher
             from skillNer.skill_extractor_class import SkillExtractor as SkillNER
             from skillNer.general_params import SKILL_DB
-            from sqlalchemy import text
+            from skillNer.cleaner import Cleaner
             from src.utils.skill_filters import is_valid_skill
             
             # Initialize SkillNER directly
@@ -420,24 +500,52 @@ class DailyJobScraper:
             skill_extractor = SkillNER(nlp, SKILL_DB, PhraseMatcher)
             logger.info(f"SkillNER initialized with {len(SKILL_DB)} EMSI skills")
             
-            # Get recently added jobs
-            recent_jobs = db.query(JobPosting).filter(
+            # Extraction runs as one transaction; don't wait on WAL flush at commit
+            db.execute(text("SET LOCAL synchronous_commit = OFF"))
+            
+            # Stream recently added jobs instead of loading full ORM rows
+            recent_jobs = db.query(
+                JobPosting.id, JobPosting.title, JobPosting.description
+            ).filter(
                 JobPosting.source == "adzuna_daily"
-            ).all()
+            ).yield_per(500)
             
             skill_relationships = 0
+            skill_rows = []
             
-            for job in recent_jobs:
+            # Parse jobs in batches with nlp.pipe; SkillNER then reuses each doc
+            cleaner = Cleaner(
+                include_cleaning_functions=["remove_punctuation", "remove_extra_space"],
+                to_lowercase=False
+            )
+            # Skip jobs with almost no text; parsing them costs as much and finds little
+            job_texts = (
+                (job_id, job_text)
+                for job_id, job_text in (
+                    (job_id, f"{title} {description or ''}")
+                    for job_id, title, description in recent_jobs
+                )
+                if len(job_text) >= MIN_SKILLNER_TEXT_LENGTH
+            )
+            if self.skillner_processes > 1:
+                # Drain the streaming cursor before spaCy forks its workers
+                job_texts = list(job_texts)
+            docs = nlp.pipe(
+                ((cleaner(job_text).lower(), (job_id, job_text)) for job_id, job_text in job_texts),
+                as_tuples=True,
+                batch_size=SKILLNER_BATCH_SIZE,
+                n_process=self.skillner_processes
+            )
+            skill_extractor.nlp = PreParsedNLP(nlp)
+            
+            for doc, (job_id, job_text) in docs:
                 try:
-                    # Combine title and description for skill extraction
-                    job_text = f"{job.title} {job.description or ''}"
-                    
                     # Extract skills using direct SkillNER
+                    skill_extractor.nlp.doc = doc
                     annotations = skill_extractor.annotate(job_text)
                     
                     # Process full matches (exact EMSI skills, highest confidence)
                     for match in annotations['results']['full_matches']:
-                        skill_id = match['skill_id']
                         skill_name = match['doc_node_value']
                         confidence = match['score']
                         
@@ -445,57 +553,43 @@ class DailyJobScraper:
                         if not is_valid_skill(skill_name):
                             continue
                         
-                        try:
-                            db.execute(text("""
-                                INSERT INTO job_skills_emsi 
-                                (job_id, emsi_skill_id, skill_name, extraction_method, confidence, importance, is_required)
-                                VALUES (:job_id, :emsi_skill_id, :skill_name, :extraction_method, :confidence, :importance, :is_required)
-                                ON CONFLICT (job_id, emsi_skill_id) DO NOTHING
-                            """), {
-                                'job_id': job.id,
-                                'emsi_skill_id': skill_id,
-                                'skill_name': skill_name,
-                                'extraction_method': 'skillner_full',
-                                'confidence': confidence,
-                                'importance': confidence,
-                                'is_required': confidence >= 1.0
-                            })
-                            skill_relationships += 1
-                        except Exception as e:
-                            logger.error(f"Error saving skill {skill_id}: {e}")
+                        skill_rows.append({
+                            'job_id': job_id,
+                            'emsi_skill_id': match['skill_id'],
+                            'skill_name': skill_name,
+                            'extraction_method': 'skillner_full',
+                            'confidence': confidence,
+                            'importance': confidence,
+                            'is_required': confidence >= 1.0
+                        })
                     
                     # Process high-confidence n-gram matches 
                     for match in annotations['results']['ngram_scored']:
-                        skill_id = match['skill_id']
                         skill_name = match['doc_node_value']
                         confidence = match['score']
                         match_type = match.get('type', 'ngram')
                         
                         # Only include high-confidence matches and filter invalid skills
                         if confidence >= 0.8 and is_valid_skill(skill_name):
-                            try:
-                                db.execute(text("""
-                                    INSERT INTO job_skills_emsi 
-                                    (job_id, emsi_skill_id, skill_name, extraction_method, confidence, importance, is_required)
-                                    VALUES (:job_id, :emsi_skill_id, :skill_name, :extraction_method, :confidence, :importance, :is_required)
-                                    ON CONFLICT (job_id, emsi_skill_id) DO NOTHING
-                                """), {
-                                    'job_id': job.id,
-                                    'emsi_skill_id': skill_id,
-                                    'skill_name': skill_name,
-                                    'extraction_method': f'skillner_{match_type}',
-                                    'confidence': confidence,
-                                    'importance': confidence,
-                                    'is_required': confidence >= 1.0
-                                })
-                                skill_relationships += 1
-                            except Exception as e:
-                                logger.error(f"Error saving skill {skill_id}: {e}")
+                            skill_rows.append({
+                                'job_id': job_id,
+                                'emsi_skill_id': match['skill_id'],
+                                'skill_name': skill_name,
+                                'extraction_method': f'skillner_{match_type}',
+                                'confidence': confidence,
+                                'importance': confidence,
+                                'is_required': confidence >= 1.0
+                            })
                             
                 except Exception as e:
-                    logger.error(f"Error extracting skills for job {job.id}: {e}")
+                    logger.error(f"Error extracting skills for job {job_id}: {e}")
                     continue
+                
+                if len(skill_rows) >= EMSI_INSERT_BATCH_SIZE:
+                    skill_relationships += self._save_emsi_skills(db, skill_rows)
+                    skill_rows = []
             
+            skill_relationships += self._save_emsi_skills(db, skill_rows)
             db.commit()
             logger.info(f"  Created {skill_relationships} EMSI job-skill relationships using direct SkillNER")
             
@@ -503,12 +597,30 @@ class DailyJobScraper:
             logger.error(f"SkillNER not available, falling back to simple extraction: {e}")
             self._extract_skills_simple_fallback(db)
     
+    def _save_emsi_skills(self, db, skill_rows: List[Dict]) -> int:
+        """Insert buffered job_skills_emsi rows in a single executemany"""
+        if not skill_rows:
+            return 0
+        
+        db.execute(EMSI_SKILL_INSERT, skill_rows)
+        return len(skill_rows)
+    
     def _extract_skills_simple_fallback(self, db):
         """Fallback simple skill extraction if SkillNER is not available"""
+        # Load all skill ids once so lookups don't hit the database per match
+        self._skill_id_cache = {
+            name.lower(): skill_id for skill_id, name in db.query(Skill.id, Skill.name)
+        }
+        
+        # Extraction runs as one transaction; don't wait on WAL flush at commit
+        db.execute(text("SET LOCAL synchronous_commit = OFF"))
+        
         # Simple patterns as backup
-        recent_jobs = db.query(JobPosting).filter(
+        recent_jobs = db.query(
+            JobPosting.id, JobPosting.title, JobPosting.description
+        ).filter(
             JobPosting.source == "adzuna_daily"
-        ).all()
+        ).yield_per(500)
         
         basic_skills = {
             "Python": ["python", "py"],
@@ -523,25 +635,23 @@ class DailyJobScraper:
             "Leadership": ["leadership", "lead", "manage"],
         }
         
+        matcher = KeywordMatcher(basic_skills)
         skill_relationships = 0
         
-        for job in recent_jobs:
-            job_text = f"{job.title} {job.description or ''}".lower()
-            
-            for skill_name, patterns in basic_skills.items():
-                for pattern in patterns:
-                    if pattern in job_text:
-                        skill_id = self._find_or_create_skill(db, skill_name, "TECHNICAL")
-                        if skill_id:
-                            job_skill = JobSkill(
-                                job_id=job.id,
-                                skill_id=skill_id,
-                                importance=1.0,
-                                is_required=1
-                            )
-                            db.add(job_skill)
-                            skill_relationships += 1
-                        break
+        for job_id, title, description in recent_jobs:
+            job_text = f"{title} {description or ''}".lower()
+            
+            for skill_name in matcher.find_ordered(job_text):
+                skill_id = self._find_or_create_skill(db, skill_name, "TECHNICAL")
+                if skill_id:
+                    job_skill = JobSkill(
+                        job_id=job_id,
+                        skill_id=skill_id,
+                        importance=1.0,
+                        is_required=1
+                    )
+                    db.add(job_skill)
+                    skill_relationships += 1
         
         db.commit()
         logger.info(f"  Created {skill_relationships} job-skill relationships using simple fallback")
@@ -550,12 +660,9 @@ class DailyJobScraper:
         """Find existing skill or create new one"""
         try:
             # Look for existing skill
-            existing_skill = db.query(Skill).filter(
-                Skill.name.ilike(skill_name)
-            ).first()
-            
-            if existing_skill:
-                return existing_skill.id
+            skill_id = self._skill_id_cache.get(skill_name.lower())
+            if skill_id:
+                return skill_id
             
             # Create new skill
             new_skill = Skill(
@@ -566,6 +673,8 @@ class DailyJobScraper:
             db.add(new_skill)
             db.flush()
             
+            self._skill_id_cache[skill_name.lower()] = new_skill.id
+            
             logger.debug(f"Created new skill: {skill_name} ({skill_type})")
             return new_skill.id
             
@@ -581,6 +690,10 @@ def main():
     parser.add_argument("--mode", choices=["append", "replace"], default="append", 
                        help="Database mode: append new jobs or replace existing daily jobs")
     parser.add_argument("--test", action="store_true", help="Test mode - don't save to database")
+    parser.add_argument("--reindex", action="store_true",
+                       help="In replace mode, drop and rebuild the category index around the load")
+    parser.add_argument("--skillner-processes", type=int, default=SKILLNER_PROCESSES,
+                       help="spaCy worker processes for SkillNER extraction (default: 1)")
     
     args = parser.parse_args()
     
@@ -588,7 +701,7 @@ def main():
         from dotenv import load_dotenv
         load_dotenv("/home/v999/Desktop/skill-match/secrets/.env.adzuna")
         
-        scraper = DailyJobScraper(days_back=args.days)
+        scraper = DailyJobScraper(days_back=args.days, skillner_processes=args.skillner_processes)
         
         logger.info(f"🚀 Starting daily job scraper...")
         logger.info(f"📅 Mode: {args.mode}, Days back: {args.days}, Test: {args.test}")
@@ -598,7 +711,7 @@ def main():
         if args.test:
             logger.info(f"🧪 TEST MODE - Found {len(jobs)} jobs (not saved)")
         else:
-            saved_count = scraper.save_to_database(jobs, mode=args.mode)
+            saved_count = scraper.save_to_database(jobs, mode=args.mode, reindex=args.reindex)
             
             print(f"\n" + "=" * 60)
             print(f"🎉 DAILY JOB SCRAPE COMPLETED!")
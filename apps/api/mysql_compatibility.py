@@ -1,36 +1,83 @@
+import argparse
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-def update_models_for_mysql():
-    models_dir = "src/models"
+# PostgreSQL to MySQL replacements
+REPLACEMENTS = {
+    'from sqlalchemy.dialects.postgresql import UUID': 'from sqlalchemy import String',
+    'UUID(as_uuid=True)': 'String(36)',
+    'server_default=text("uuid_generate_v4()")': 'server_default=text("(UUID())")',
+    'JSONB': 'JSON',
+    'postgresql.JSONB': 'JSON',
+    'postgresql.UUID': 'String(36)',
+}
+
+# One alternation applies every replacement in a single pass; longest keys
+# first so e.g. postgresql.UUID wins over a bare UUID match
+REPLACEMENT_PATTERN = re.compile(
+    "|".join(re.escape(old) for old in sorted(REPLACEMENTS, key=len, reverse=True))
+)
+
+def _replacement(match):
+    return REPLACEMENTS[match.group(0)]
+
+# Every replacement key contains one of these, so files without any of them
+# can be skipped before decoding or running the regex
+TRIGGER_TOKENS = (b'UUID', b'JSONB', b'uuid_generate_v4', b'postgresql')
+
+def _process(filepath, output_path):
+    """Write the MySQL version of one model file, returning a message if it differs"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    
+    converted = data
+    if any(token in data for token in TRIGGER_TOKENS):
+        converted = REPLACEMENT_PATTERN.sub(_replacement, data.decode('utf-8')).encode('utf-8')
+    
+    if output_path != filepath or converted != data:
+        with open(output_path, 'wb') as f:
+            f.write(converted)
+    
+    if converted == data:
+        return None
+    return f"Updated {os.path.basename(filepath)} for MySQL compatibility"
+
+def update_models_for_mysql(models_dir="src/models", output_dir="src/models_mysql"):
+    """Generate MySQL variants of the model files into output_dir.
+    
+    Meant to run once at build time; pass output_dir=models_dir to patch the
+    models in place as before.
+    """
     if not os.path.exists(models_dir):
         print(f"Models directory {models_dir} not found")
         return
-        
-    for filename in os.listdir(models_dir):
-        if filename.endswith(".py"):
-            filepath = os.path.join(models_dir, filename)
-            with open(filepath, 'r') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # PostgreSQL to MySQL replacements
-            replacements = {
-                'from sqlalchemy.dialects.postgresql import UUID': 'from sqlalchemy import String',
-                'UUID(as_uuid=True)': 'String(36)',
-                'server_default=text("uuid_generate_v4()")': 'server_default=text("(UUID())")',
-                'JSONB': 'JSON',
-                'postgresql.JSONB': 'JSON',
-                'postgresql.UUID': 'String(36)',
-            }
-            
-            for old, new in replacements.items():
-                content = content.replace(old, new)
-            
-            if content != original_content:
-                with open(filepath, 'w') as f:
-                    f.write(content)
-                print(f"Updated {filename} for MySQL compatibility")
+    
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # DirEntry carries the file type from the directory read, so no extra stat
+    with os.scandir(models_dir) as entries:
+        filepaths = [
+            entry.path
+            for entry in entries
+            if entry.name.endswith(".py") and entry.is_file()
+        ]
+    output_paths = [os.path.join(output_dir, os.path.basename(path)) for path in filepaths]
+    
+    # Files are independent and the work is mostly I/O, so overlap it; messages
+    # are printed afterwards in file order rather than interleaved
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+        messages = list(executor.map(_process, filepaths, output_paths))
+    
+    for message in messages:
+        if message:
+            print(message)
 
-update_models_for_mysql()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate MySQL-compatible SQLAlchemy models")
+    parser.add_argument("--models-dir", default="src/models")
+    parser.add_argument("--output-dir", default="src/models_mysql")
+    parser.add_argument("--in-place", action="store_true", help="Patch --models-dir instead of writing --output-dir")
+    args = parser.parse_args()
+    
+    update_models_for_mysql(args.models_dir, args.models_dir if args.in_place else args.output_dir)
@@ -9,8 +9,8 @@ from pathlib import Path
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from src.db.database import SessionLocal
-from sqlalchemy import text
+from src.db.database import engine
+from src.db.ddl import create_indexes_concurrently, execute_statements
 
 # Setup logging
 logging.basicConfig(
@@ -20,233 +20,435 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def create_skill_mapping_schema():
-    """Create the skill mapping schema"""
+# Extensions
+EXTENSION_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+]
+
+# Enums (CREATE TYPE has no IF NOT EXISTS)
+ENUM_STATEMENTS = [
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'skill_type_enum') THEN
+            CREATE TYPE skill_type_enum AS ENUM ('technical', 'soft', 'domain');
+        END IF;
+    END
+    $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'alias_type_enum') THEN
+            CREATE TYPE alias_type_enum AS ENUM ('abbreviation', 'synonym', 'variation', 'alternative');
+        END IF;
+    END
+    $$
+    """,
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'learning_status_enum') THEN
+            CREATE TYPE learning_status_enum AS ENUM ('pending', 'approved', 'rejected');
+        END IF;
+    END
+    $$
+    """,
+]
+
+# Tables
+TABLE_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS skill_categories_v2 (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        parent_id INTEGER REFERENCES skill_categories_v2(id) ON DELETE CASCADE,
+        level INTEGER NOT NULL DEFAULT 1,
+        esco_uri VARCHAR(500),
+        description TEXT,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(name, parent_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS skills_v2 (
+        id SERIAL PRIMARY KEY,
+        name VARCHAR(255) NOT NULL UNIQUE,
+        category_id INTEGER NOT NULL REFERENCES skill_categories_v2(id) ON DELETE CASCADE,
+        esco_uri VARCHAR(500) UNIQUE,
+        skill_type skill_type_enum NOT NULL,
+        description TEXT,
+        is_canonical BOOLEAN NOT NULL DEFAULT TRUE,
+        complexity_level INTEGER,
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS skill_aliases (
+        id SERIAL PRIMARY KEY,
+        skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
+        alias VARCHAR(255) NOT NULL,
+        alias_type alias_type_enum NOT NULL,
+        confidence FLOAT NOT NULL DEFAULT 1.0,
+        source VARCHAR(50) NOT NULL DEFAULT 'manual',
+        is_approved BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(skill_id, alias)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS skill_embeddings (
+        id SERIAL PRIMARY KEY,
+        skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
+        vector FLOAT[],
+        model_name VARCHAR(100) NOT NULL DEFAULT 'all-MiniLM-L6-v2',
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(skill_id, model_name)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS job_skills_v2 (
+        id SERIAL PRIMARY KEY,
+        job_id INTEGER NOT NULL REFERENCES job_postings(id) ON DELETE CASCADE,
+        skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
+        importance FLOAT NOT NULL DEFAULT 1.0,
+        tf_idf_score FLOAT,
+        extraction_method VARCHAR(50) NOT NULL,
+        confidence FLOAT NOT NULL DEFAULT 1.0,
+        is_required BOOLEAN NOT NULL DEFAULT TRUE,
+        context TEXT,
+        created_at TIMESTAMP DEFAULT NOW(),
+        UNIQUE(job_id, skill_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS skill_learning_queue (
+        id SERIAL PRIMARY KEY,
+        potential_skill VARCHAR(255) NOT NULL UNIQUE,
+        suggested_skill_id INTEGER REFERENCES skills_v2(id) ON DELETE SET NULL,
+        similarity_score FLOAT NOT NULL,
+        extraction_context TEXT,
+        job_id INTEGER REFERENCES job_postings(id) ON DELETE SET NULL,
+        frequency INTEGER NOT NULL DEFAULT 1,
+        status learning_status_enum NOT NULL DEFAULT 'pending',
+        reviewed_by VARCHAR(100),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMP DEFAULT NOW()
+    )
+    """,
+]
+
+# Table indexes
+INDEX_STATEMENTS = [
+    # skill_categories_v2 indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_categories_v2_parent_id ON skill_categories_v2(parent_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_categories_v2_level ON skill_categories_v2(level)",
     
-    logger.info("🚀 Creating Skill Mapping Schema...")
+    # skills_v2 indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skills_v2_category_id ON skills_v2(category_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skills_v2_skill_type ON skills_v2(skill_type)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skills_v2_is_canonical ON skills_v2(is_canonical)",
     
-    db = SessionLocal()
+    # skill_aliases indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_aliases_skill_id ON skill_aliases(skill_id)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_aliases_alias ON skill_aliases(alias)",
+    # Trigram index so ILIKE / similarity() alias lookups don't scan the table
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_aliases_alias_trgm ON skill_aliases USING gin (alias gin_trgm_ops)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_aliases_type ON skill_aliases(alias_type)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_aliases_approved ON skill_aliases(is_approved)",
     
-    try:
-        # Create enums
-        logger.info("Creating enums...")
-        db.execute(text("CREATE TYPE skill_type_enum AS ENUM ('technical', 'soft', 'domain');"))
-        db.execute(text("CREATE TYPE alias_type_enum AS ENUM ('abbreviation', 'synonym', 'variation', 'alternative');"))
-        db.execute(text("CREATE TYPE learning_status_enum AS ENUM ('pending', 'approved', 'rejected');"))
-        
-        # Create skill_categories_v2 table
-        logger.info("Creating skill_categories_v2...")
-        db.execute(text("""
-            CREATE TABLE skill_categories_v2 (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL,
-                parent_id INTEGER REFERENCES skill_categories_v2(id) ON DELETE CASCADE,
-                level INTEGER NOT NULL DEFAULT 1,
-                esco_uri VARCHAR(500),
-                description TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW(),
-                UNIQUE(name, parent_id)
-            );
-        """))
-        
-        # Create skills_v2 table
-        logger.info("Creating skills_v2...")
-        db.execute(text("""
-            CREATE TABLE skills_v2 (
-                id SERIAL PRIMARY KEY,
-                name VARCHAR(255) NOT NULL UNIQUE,
-                category_id INTEGER NOT NULL REFERENCES skill_categories_v2(id) ON DELETE CASCADE,
-                esco_uri VARCHAR(500) UNIQUE,
-                skill_type skill_type_enum NOT NULL,
-                description TEXT,
-                is_canonical BOOLEAN NOT NULL DEFAULT TRUE,
-                complexity_level INTEGER,
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            );
-        """))
-        
-        # Create skill_aliases table
-        logger.info("Creating skill_aliases...")
-        db.execute(text("""
-            CREATE TABLE skill_aliases (
-                id SERIAL PRIMARY KEY,
-                skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
-                alias VARCHAR(255) NOT NULL,
-                alias_type alias_type_enum NOT NULL,
-                confidence FLOAT NOT NULL DEFAULT 1.0,
-                source VARCHAR(50) NOT NULL DEFAULT 'manual',
-                is_approved BOOLEAN NOT NULL DEFAULT TRUE,
-                created_at TIMESTAMP DEFAULT NOW(),
-                UNIQUE(skill_id, alias)
-            );
-        """))
-        
-        # Create skill_embeddings table
-        logger.info("Creating skill_embeddings...")
-        db.execute(text("""
-            CREATE TABLE skill_embeddings (
-                id SERIAL PRIMARY KEY,
-                skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
-                vector FLOAT[],
-                model_name VARCHAR(100) NOT NULL DEFAULT 'all-MiniLM-L6-v2',
-                created_at TIMESTAMP DEFAULT NOW(),
-                UNIQUE(skill_id, model_name)
-            );
-        """))
-        
-        # Create job_skills_v2 table
-        logger.info("Creating job_skills_v2...")
-        db.execute(text("""
-            CREATE TABLE job_skills_v2 (
-                id SERIAL PRIMARY KEY,
-                job_id INTEGER NOT NULL REFERENCES job_postings(id) ON DELETE CASCADE,
-                skill_id INTEGER NOT NULL REFERENCES skills_v2(id) ON DELETE CASCADE,
-                importance FLOAT NOT NULL DEFAULT 1.0,
-                tf_idf_score FLOAT,
-                extraction_method VARCHAR(50) NOT NULL,
-                confidence FLOAT NOT NULL DEFAULT 1.0,
-                is_required BOOLEAN NOT NULL DEFAULT TRUE,
-                context TEXT,
-                created_at TIMESTAMP DEFAULT NOW(),
-                UNIQUE(job_id, skill_id)
-            );
-        """))
-        
-        # Create skill_learning_queue table
-        logger.info("Creating skill_learning_queue...")
-        db.execute(text("""
-            CREATE TABLE skill_learning_queue (
-                id SERIAL PRIMARY KEY,
-                potential_skill VARCHAR(255) NOT NULL UNIQUE,
-                suggested_skill_id INTEGER REFERENCES skills_v2(id) ON DELETE SET NULL,
-                similarity_score FLOAT NOT NULL,
-                extraction_context TEXT,
-                job_id INTEGER REFERENCES job_postings(id) ON DELETE SET NULL,
-                frequency INTEGER NOT NULL DEFAULT 1,
-                status learning_status_enum NOT NULL DEFAULT 'pending',
-                reviewed_by VARCHAR(100),
-                created_at TIMESTAMP DEFAULT NOW(),
-                updated_at TIMESTAMP DEFAULT NOW()
-            );
-        """))
-        
-        # Create indexes
-        logger.info("Creating indexes...")
-        
-        # skill_categories_v2 indexes
-        db.execute(text("CREATE INDEX idx_skill_categories_v2_parent_id ON skill_categories_v2(parent_id);"))
-        db.execute(text("CREATE INDEX idx_skill_categories_v2_level ON skill_categories_v2(level);"))
-        
-        # skills_v2 indexes
-        db.execute(text("CREATE INDEX idx_skills_v2_category_id ON skills_v2(category_id);"))
-        db.execute(text("CREATE INDEX idx_skills_v2_skill_type ON skills_v2(skill_type);"))
-        db.execute(text("CREATE INDEX idx_skills_v2_is_canonical ON skills_v2(is_canonical);"))
-        
-        # skill_aliases indexes
-        db.execute(text("CREATE INDEX idx_skill_aliases_skill_id ON skill_aliases(skill_id);"))
-        db.execute(text("CREATE INDEX idx_skill_aliases_alias ON skill_aliases(alias);"))
-        db.execute(text("CREATE INDEX idx_skill_aliases_type ON skill_aliases(alias_type);"))
-        db.execute(text("CREATE INDEX idx_skill_aliases_approved ON skill_aliases(is_approved);"))
+    # skill_embeddings indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_embeddings_skill_id ON skill_embeddings(skill_id)",
+    
+    # job_skills_v2 indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_skills_v2_job_id ON job_skills_v2(job_id)",
+    # Covers the demand aggregation so it can be served by an index-only scan
+    """
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_skills_v2_skill_cover ON job_skills_v2(skill_id, job_id)
+    INCLUDE (importance, tf_idf_score, extraction_method, confidence)
+    """,
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_skills_v2_importance ON job_skills_v2(importance)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_skills_v2_extraction_method ON job_skills_v2(extraction_method)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_skills_v2_confidence ON job_skills_v2(confidence)",
+    
+    # job_postings indexes used by the demand aggregation
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_postings_active_date ON job_postings(is_active, scraped_date) WHERE is_active = 1",
+    # Postings are appended in scrape order, so a BRIN index gives date-range
+    # scans block-range pruning much like monthly partitions would, without
+    # changing the primary key every job_* table references
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_job_postings_scraped_date_brin ON job_postings USING brin (scraped_date)",
+    
+    # skill_learning_queue indexes
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_learning_queue_status ON skill_learning_queue(status)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_learning_queue_similarity ON skill_learning_queue(similarity_score)",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_skill_learning_queue_frequency ON skill_learning_queue(frequency)",
+]
+
+# Incrementally maintained per-(skill, day, source) demand aggregate.
+# Triggers on job_skills_v2 and job_postings add or subtract each row's
+# contribution (counting algorithm), so keeping it current costs work
+# proportional to the rows changed instead of a full re-aggregation.
+# It stays a heap table rather than columnar storage since the triggers update
+# rows in place; none of the counters are indexed, so leaving page free space
+# lets those updates be HOT and skip index maintenance.
+DEMAND_AGG_STATEMENTS = [
+    """
+    CREATE TABLE IF NOT EXISTS skill_demand_daily_agg (
+        skill_id INTEGER NOT NULL,
+        day DATE NOT NULL,
+        source VARCHAR(50) NOT NULL,
+        postings INTEGER NOT NULL DEFAULT 0,
+        importance_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+        tf_idf_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+        tf_idf_count INTEGER NOT NULL DEFAULT 0,
+        confidence_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+        skillner_extractions INTEGER NOT NULL DEFAULT 0,
+        sbert_extractions INTEGER NOT NULL DEFAULT 0,
+        regex_extractions INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (skill_id, day, source)
+    ) WITH (fillfactor = 80)
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_skill_demand_daily_agg_day ON skill_demand_daily_agg(day)",
+    """
+    CREATE OR REPLACE FUNCTION skill_demand_apply(
+        p_skill_id INTEGER, p_day DATE, p_source VARCHAR, p_sign INTEGER,
+        p_importance FLOAT, p_tf_idf FLOAT, p_confidence FLOAT, p_method VARCHAR
+    ) RETURNS VOID AS $$
+    BEGIN
+        IF p_day IS NULL THEN
+            RETURN;
+        END IF;
         
-        # skill_embeddings indexes
-        db.execute(text("CREATE INDEX idx_skill_embeddings_skill_id ON skill_embeddings(skill_id);"))
+        INSERT INTO skill_demand_daily_agg AS agg (
+            skill_id, day, source, postings, importance_sum, tf_idf_sum, tf_idf_count,
+            confidence_sum, skillner_extractions, sbert_extractions, regex_extractions
+        ) VALUES (
+            p_skill_id, p_day, p_source, p_sign, p_sign * p_importance,
+            p_sign * COALESCE(p_tf_idf, 0),
+            CASE WHEN p_tf_idf IS NULL THEN 0 ELSE p_sign END,
+            p_sign * p_confidence,
+            CASE WHEN p_method = 'skillner' THEN p_sign ELSE 0 END,
+            CASE WHEN p_method = 'sbert' THEN p_sign ELSE 0 END,
+            CASE WHEN p_method = 'regex' THEN p_sign ELSE 0 END
+        )
+        ON CONFLICT (skill_id, day, source) DO UPDATE SET
+            postings = agg.postings + EXCLUDED.postings,
+            importance_sum = agg.importance_sum + EXCLUDED.importance_sum,
+            tf_idf_sum = agg.tf_idf_sum + EXCLUDED.tf_idf_sum,
+            tf_idf_count = agg.tf_idf_count + EXCLUDED.tf_idf_count,
+            confidence_sum = agg.confidence_sum + EXCLUDED.confidence_sum,
+            skillner_extractions = agg.skillner_extractions + EXCLUDED.skillner_extractions,
+            sbert_extractions = agg.sbert_extractions + EXCLUDED.sbert_extractions,
+            regex_extractions = agg.regex_extractions + EXCLUDED.regex_extractions;
         
-        # job_skills_v2 indexes
-        db.execute(text("CREATE INDEX idx_job_skills_v2_job_id ON job_skills_v2(job_id);"))
-        db.execute(text("CREATE INDEX idx_job_skills_v2_skill_id ON job_skills_v2(skill_id);"))
-        db.execute(text("CREATE INDEX idx_job_skills_v2_importance ON job_skills_v2(importance);"))
-        db.execute(text("CREATE INDEX idx_job_skills_v2_extraction_method ON job_skills_v2(extraction_method);"))
-        db.execute(text("CREATE INDEX idx_job_skills_v2_confidence ON job_skills_v2(confidence);"))
+        -- Groups whose count drops to zero disappear, as they would from a full rebuild
+        IF p_sign < 0 THEN
+            DELETE FROM skill_demand_daily_agg
+            WHERE skill_id = p_skill_id AND day = p_day AND source = p_source AND postings <= 0;
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION job_skills_v2_demand_trigger() RETURNS TRIGGER AS $$
+    DECLARE
+        jp RECORD;
+    BEGIN
+        -- A job deleted with its skills was already subtracted by job_postings_demand_trigger
+        IF TG_OP IN ('DELETE', 'UPDATE') THEN
+            SELECT scraped_date, source, is_active INTO jp FROM job_postings WHERE id = OLD.job_id;
+            IF FOUND AND jp.is_active = 1 THEN
+                PERFORM skill_demand_apply(OLD.skill_id, DATE(jp.scraped_date), jp.source, -1,
+                                           OLD.importance, OLD.tf_idf_score, OLD.confidence,
+                                           OLD.extraction_method);
+            END IF;
+        END IF;
         
-        # skill_learning_queue indexes
-        db.execute(text("CREATE INDEX idx_skill_learning_queue_status ON skill_learning_queue(status);"))
-        db.execute(text("CREATE INDEX idx_skill_learning_queue_similarity ON skill_learning_queue(similarity_score);"))
-        db.execute(text("CREATE INDEX idx_skill_learning_queue_frequency ON skill_learning_queue(frequency);"))
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT scraped_date, source, is_active INTO jp FROM job_postings WHERE id = NEW.job_id;
+            IF FOUND AND jp.is_active = 1 THEN
+                PERFORM skill_demand_apply(NEW.skill_id, DATE(jp.scraped_date), jp.source, 1,
+                                           NEW.importance, NEW.tf_idf_score, NEW.confidence,
+                                           NEW.extraction_method);
+            END IF;
+        END IF;
         
-        # Drop old materialized views
-        logger.info("Dropping old materialized views...")
-        db.execute(text("DROP MATERIALIZED VIEW IF EXISTS skill_demand_summary;"))
-        db.execute(text("DROP MATERIALIZED VIEW IF EXISTS skill_demand_daily;"))
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE FUNCTION job_postings_demand_trigger() RETURNS TRIGGER AS $$
+    BEGIN
+        IF OLD.is_active = 1 THEN
+            PERFORM skill_demand_apply(js.skill_id, DATE(OLD.scraped_date), OLD.source, -1,
+                                       js.importance, js.tf_idf_score, js.confidence,
+                                       js.extraction_method)
+            FROM job_skills_v2 js WHERE js.job_id = OLD.id;
+        END IF;
         
-        # Create new materialized views
-        logger.info("Creating new materialized views...")
-        db.execute(text("""
-            CREATE MATERIALIZED VIEW skill_demand_daily AS
-            SELECT 
-                s.id AS skill_id,
-                s.name AS skill_name,
-                sc.name AS category_name,
-                sc.level AS category_level,
-                COUNT(DISTINCT js.job_id) AS postings,
-                DATE(jp.scraped_date) AS day,
-                AVG(js.importance) AS avg_importance,
-                AVG(js.tf_idf_score) AS avg_tf_idf,
-                jp.source,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'skillner' THEN js.id END) AS skillner_extractions,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'sbert' THEN js.id END) AS sbert_extractions,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'regex' THEN js.id END) AS regex_extractions
-            FROM job_skills_v2 js
-            JOIN job_postings jp ON js.job_id = jp.id
-            JOIN skills_v2 s ON js.skill_id = s.id
-            JOIN skill_categories_v2 sc ON s.category_id = sc.id
-            WHERE jp.is_active = 1
-            GROUP BY s.id, s.name, sc.name, sc.level, DATE(jp.scraped_date), jp.source
-            ORDER BY day DESC, postings DESC;
-        """))
+        IF TG_OP = 'DELETE' THEN
+            RETURN OLD;
+        END IF;
         
-        db.execute(text("""
-            CREATE MATERIALIZED VIEW skill_demand_summary AS
-            SELECT 
-                s.id AS skill_id,
-                s.name AS skill_name,
-                s.skill_type,
-                s.esco_uri,
-                sc.name AS category_name,
-                sc.level AS category_level,
-                COUNT(DISTINCT js.job_id) AS total_postings,
-                COUNT(DISTINCT jp.source) AS source_count,
-                AVG(js.importance) AS avg_importance,
-                AVG(js.tf_idf_score) AS avg_tf_idf,
-                AVG(js.confidence) AS avg_confidence,
-                MIN(jp.scraped_date) AS first_seen,
-                MAX(jp.scraped_date) AS last_seen,
-                COUNT(DISTINCT CASE WHEN jp.scraped_date >= CURRENT_DATE - INTERVAL '30 days' THEN js.job_id END) AS postings_last_30_days,
-                COUNT(DISTINCT CASE WHEN jp.scraped_date >= CURRENT_DATE - INTERVAL '7 days' THEN js.job_id END) AS postings_last_7_days,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'skillner' THEN js.id END) AS skillner_extractions,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'sbert' THEN js.id END) AS sbert_extractions,
-                COUNT(DISTINCT CASE WHEN js.extraction_method = 'regex' THEN js.id END) AS regex_extractions
-            FROM job_skills_v2 js
-            JOIN job_postings jp ON js.job_id = jp.id
-            JOIN skills_v2 s ON js.skill_id = s.id
-            JOIN skill_categories_v2 sc ON s.category_id = sc.id
-            WHERE jp.is_active = 1
-            GROUP BY s.id, s.name, s.skill_type, s.esco_uri, sc.name, sc.level
-            ORDER BY total_postings DESC;
-        """))
+        IF NEW.is_active = 1 THEN
+            PERFORM skill_demand_apply(js.skill_id, DATE(NEW.scraped_date), NEW.source, 1,
+                                       js.importance, js.tf_idf_score, js.confidence,
+                                       js.extraction_method)
+            FROM job_skills_v2 js WHERE js.job_id = NEW.id;
+        END IF;
         
-        # Create materialized view indexes
-        db.execute(text("CREATE INDEX idx_skill_demand_daily_v2_day ON skill_demand_daily(day);"))
-        db.execute(text("CREATE INDEX idx_skill_demand_daily_v2_skill_id ON skill_demand_daily(skill_id);"))
-        db.execute(text("CREATE INDEX idx_skill_demand_daily_v2_category ON skill_demand_daily(category_name);"))
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS job_skills_v2_demand ON job_skills_v2",
+    """
+    CREATE TRIGGER job_skills_v2_demand
+    AFTER INSERT OR DELETE OR UPDATE OF job_id, skill_id, importance, tf_idf_score, confidence, extraction_method
+    ON job_skills_v2
+    FOR EACH ROW EXECUTE FUNCTION job_skills_v2_demand_trigger()
+    """,
+    # BEFORE DELETE so the job's skills are still there to subtract when the
+    # cascade removes them
+    "DROP TRIGGER IF EXISTS job_postings_demand_delete ON job_postings",
+    """
+    CREATE TRIGGER job_postings_demand_delete
+    BEFORE DELETE ON job_postings
+    FOR EACH ROW EXECUTE FUNCTION job_postings_demand_trigger()
+    """,
+    "DROP TRIGGER IF EXISTS job_postings_demand_update ON job_postings",
+    """
+    CREATE TRIGGER job_postings_demand_update
+    AFTER UPDATE OF is_active, scraped_date, source ON job_postings
+    FOR EACH ROW
+    WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active
+          OR OLD.scraped_date IS DISTINCT FROM NEW.scraped_date
+          OR OLD.source IS DISTINCT FROM NEW.source)
+    EXECUTE FUNCTION job_postings_demand_trigger()
+    """,
+    # Backfill from whatever is already in the base tables. Only an empty
+    # aggregate is filled; once populated the triggers keep it current, so a
+    # re-run must not add everything again. UNIQUE(job_id, skill_id) means
+    # every row in a group is a distinct job, so plain counts suffice
+    """
+    INSERT INTO skill_demand_daily_agg (
+        skill_id, day, source, postings, importance_sum, tf_idf_sum, tf_idf_count,
+        confidence_sum, skillner_extractions, sbert_extractions, regex_extractions
+    )
+    SELECT 
+        js.skill_id,
+        DATE(jp.scraped_date),
+        jp.source,
+        COUNT(*),
+        SUM(js.importance),
+        COALESCE(SUM(js.tf_idf_score), 0),
+        COUNT(js.tf_idf_score),
+        SUM(js.confidence),
+        COUNT(*) FILTER (WHERE js.extraction_method = 'skillner'),
+        COUNT(*) FILTER (WHERE js.extraction_method = 'sbert'),
+        COUNT(*) FILTER (WHERE js.extraction_method = 'regex')
+    FROM job_skills_v2 js
+    JOIN job_postings jp ON js.job_id = jp.id
+    WHERE jp.is_active = 1 AND jp.scraped_date IS NOT NULL
+      AND NOT EXISTS (SELECT 1 FROM skill_demand_daily_agg)
+    GROUP BY js.skill_id, DATE(jp.scraped_date), jp.source
+    """,
+]
+
+# Demand views over the trigger-maintained aggregate. Materialized views left
+# under these names by older versions are dropped first; DROP MATERIALIZED VIEW
+# errors on a plain view even with IF EXISTS, so check pg_matviews
+VIEW_STATEMENTS = [
+    """
+    DO $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'skill_demand_summary') THEN
+            DROP MATERIALIZED VIEW skill_demand_summary;
+        END IF;
+        IF EXISTS (SELECT 1 FROM pg_matviews WHERE matviewname = 'skill_demand_daily') THEN
+            DROP MATERIALIZED VIEW skill_demand_daily;
+        END IF;
+    END
+    $$
+    """,
+    """
+    CREATE OR REPLACE VIEW skill_demand_daily AS
+    SELECT 
+        s.id AS skill_id,
+        s.name AS skill_name,
+        sc.name AS category_name,
+        sc.level AS category_level,
+        agg.postings,
+        agg.day,
+        agg.importance_sum / agg.postings AS avg_importance,
+        agg.tf_idf_sum / NULLIF(agg.tf_idf_count, 0) AS avg_tf_idf,
+        agg.source,
+        agg.skillner_extractions,
+        agg.sbert_extractions,
+        agg.regex_extractions
+    FROM skill_demand_daily_agg agg
+    JOIN skills_v2 s ON agg.skill_id = s.id
+    JOIN skill_categories_v2 sc ON s.category_id = sc.id
+    """,
+    # Per-skill rollup of the same aggregate, so both views share one pass
+    # over the base tables. A job has one day and source and at most one row
+    # per skill, so summing daily postings counts each job exactly once.
+    """
+    CREATE OR REPLACE VIEW skill_demand_summary AS
+    SELECT 
+        s.id AS skill_id,
+        s.name AS skill_name,
+        s.skill_type,
+        s.esco_uri,
+        sc.name AS category_name,
+        sc.level AS category_level,
+        SUM(agg.postings) AS total_postings,
+        COUNT(DISTINCT agg.source) AS source_count,
+        SUM(agg.importance_sum) / SUM(agg.postings) AS avg_importance,
+        SUM(agg.tf_idf_sum) / NULLIF(SUM(agg.tf_idf_count), 0) AS avg_tf_idf,
+        SUM(agg.confidence_sum) / SUM(agg.postings) AS avg_confidence,
+        MIN(agg.day) AS first_seen,
+        MAX(agg.day) AS last_seen,
+        COALESCE(SUM(agg.postings) FILTER (WHERE agg.day >= CURRENT_DATE - 30), 0) AS postings_last_30_days,
+        COALESCE(SUM(agg.postings) FILTER (WHERE agg.day >= CURRENT_DATE - 7), 0) AS postings_last_7_days,
+        SUM(agg.skillner_extractions) AS skillner_extractions,
+        SUM(agg.sbert_extractions) AS sbert_extractions,
+        SUM(agg.regex_extractions) AS regex_extractions
+    FROM skill_demand_daily_agg agg
+    JOIN skills_v2 s ON agg.skill_id = s.id
+    JOIN skill_categories_v2 sc ON s.category_id = sc.id
+    GROUP BY s.id, s.name, s.skill_type, s.esco_uri, sc.name, sc.level
+    """,
+]
+
+# Everything except the base-table indexes runs in one transaction; those
+# are built afterwards with CONCURRENTLY so job_postings writers aren't blocked
+STATEMENTS = (
+    EXTENSION_STATEMENTS + ENUM_STATEMENTS + TABLE_STATEMENTS + DEMAND_AGG_STATEMENTS + VIEW_STATEMENTS
+)
+
+def create_skill_mapping_schema():
+    """Create the skill mapping schema"""
+    
+    logger.info("🚀 Creating Skill Mapping Schema...")
+    
+    try:
+        logger.info(f"Creating extensions, enums, tables and views ({len(STATEMENTS)} statements)...")
+        with engine.begin() as conn:
+            execute_statements(conn, STATEMENTS)
         
-        db.execute(text("CREATE INDEX idx_skill_demand_summary_v2_total_postings ON skill_demand_summary(total_postings);"))
-        db.execute(text("CREATE INDEX idx_skill_demand_summary_v2_category ON skill_demand_summary(category_name);"))
-        db.execute(text("CREATE INDEX idx_skill_demand_summary_v2_skill_type ON skill_demand_summary(skill_type);"))
+        logger.info(f"Creating {len(INDEX_STATEMENTS)} indexes concurrently...")
+        create_indexes_concurrently(engine, INDEX_STATEMENTS)
         
-        db.commit()
         logger.info("✅ Successfully created skill mapping schema")
         return True
         
     except Exception as e:
         logger.error(f"❌ Error creating schema: {e}")
-        db.rollback()
         return False
-    
-    finally:
-        db.close()
-
 
 def main():
     """Main function"""
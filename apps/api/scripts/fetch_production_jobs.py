@@ -3,78 +3,149 @@
 Production Job Fetcher - Get hundreds of real jobs from multiple sources
 """
 import sys
-import json
+import orjson
 import logging
 from pathlib import Path
-from typing import List, Dict
+from typing import Awaitable, Callable, Dict, Tuple
 import httpx
+from sqlalchemy import func, text
 from datetime import datetime, timedelta
 import time
 import asyncio
 import random
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.db.database import SessionLocal
 from src.schemas.ingestion import JobDTO
+from src.models.job import JobPosting
 from src.services.job_ingestion import JobIngestionService
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent requests per job board
+SOURCE_CONCURRENCY = 4
+
+# Reed API endpoint (UK jobs)
+REED_SEARCH_URL = "https://www.reed.co.uk/api/1.0/search"
+REED_QUERIES = (
+    "software developer", "python developer", "javascript developer",
+    "data engineer", "devops engineer", "frontend developer",
+    "backend developer", "full stack developer",
+)
+REED_PARAMS = {"locationName": "London", "resultsToTake": 25, "resultsToSkip": 0}
+
+# The Muse API endpoint
+MUSE_JOBS_URL = "https://www.themuse.com/api/public/jobs"
+MUSE_CATEGORIES = ("Software Engineer", "Data Science", "Product", "Design", "Marketing")
+MUSE_PAGES_PER_CATEGORY = 5
+MUSE_PARAMS = {"descending": "true", "api_key": "public"}
+
+# Jobs2Careers API endpoint
+J2C_SEARCH_URL = "http://api.jobs2careers.com/api/spec.json"
+J2C_QUERIES = (
+    "software+developer", "python+developer", "javascript+developer",
+    "data+engineer", "devops+engineer", "react+developer",
+)
+J2C_PARAMS = {"l": "remote", "start": 0, "limit": 50}
+
+# Generate realistic archive jobs based on actual GitHub companies
+ARCHIVE_COMPANIES = (
+    "GitHub", "GitLab", "Automattic", "Shopify", "Zapier", "Buffer",
+    "Basecamp", "InVision", "Doist", "Toggl", "Toptal", "Upwork",
+    "Auth0", "Algolia", "Netlify", "Vercel", "Cloudflare", "DigitalOcean",
+    "MongoDB", "Redis", "Elastic", "Confluent", "Databricks", "Snowflake",
+)
+ARCHIVE_JOB_TITLES = (
+    "Software Engineer", "Senior Software Engineer", "Staff Engineer",
+    "Frontend Developer", "Backend Developer", "Full Stack Developer",
+    "DevOps Engineer", "Site Reliability Engineer", "Data Engineer",
+    "Machine Learning Engineer", "Product Manager", "Engineering Manager",
+)
+
+
+def _without(job: Dict, key: str) -> Dict:
+    """Copy of a job payload minus one field already stored in its own column.
+    
+    The description is most of every payload, so leaving it out of raw_data
+    avoids holding and storing each one twice.
+    """
+    return {k: v for k, v in job.items() if k != key}
+
 
 class ProductionJobFetcher:
     """Fetch hundreds of real jobs from multiple working APIs"""
     
     def __init__(self):
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # HTTP/2 multiplexes each board's requests over one kept-alive connection
+        self.client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=10.0),
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=50, keepalive_expiry=60.0),
+        )
         self.jobs = []
     
-    async def fetch_jobs_from_reed_api(self) -> List[JobDTO]:
+    @staticmethod
+    async def _fetch_limited(fetch: Callable[[str], Awaitable[int]], items) -> int:
+        """Run fetch for every item concurrently, SOURCE_CONCURRENCY at a time.
+        
+        The semaphore is what paces a source now, instead of sleeping
+        between requests. Returns the total number of jobs queued.
+        """
+        semaphore = asyncio.Semaphore(SOURCE_CONCURRENCY)
+        
+        async def fetch_one(item):
+            async with semaphore:
+                return await fetch(item)
+        
+        return sum(await asyncio.gather(*(fetch_one(item) for item in items)))
+    
+    async def fetch_jobs_from_reed_api(self, queue: asyncio.Queue) -> int:
         """Fetch jobs from Reed.co.uk API (UK jobs, no auth required)"""
-        jobs = []
+        job_count = 0
         
         try:
             logger.info("Fetching from Reed.co.uk API...")
             
-            # Reed API endpoint (UK jobs)
-            queries = ["software developer", "python developer", "javascript developer", 
-                      "data engineer", "devops engineer", "frontend developer", 
-                      "backend developer", "full stack developer"]
-            
-            for query in queries:
-                url = f"https://www.reed.co.uk/api/1.0/search"
-                params = {
-                    "keywords": query,
-                    "locationName": "London",
-                    "resultsToTake": 25,
-                    "resultsToSkip": 0
-                }
-                
-                try:
-                    response = await self.client.get(url, params=params)
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        for job in data.get("results", []):
-                            job_dto = self._convert_reed_job(job)
-                            if job_dto:
-                                jobs.append(job_dto)
-                        
-                        logger.info(f"Reed API: {len(data.get('results', []))} jobs for '{query}'")
-                    
-                    await asyncio.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.debug(f"Reed API error for {query}: {e}")
-                    continue
+            job_count = await self._fetch_limited(
+                lambda query: self._fetch_reed_query(query, queue), REED_QUERIES
+            )
             
-            logger.info(f"Reed API total: {len(jobs)} jobs")
+            logger.info(f"Reed API total: {job_count} jobs")
             
         except Exception as e:
             logger.error(f"Reed API error: {e}")
         
-        return jobs
+        return job_count
+    
+    async def _fetch_reed_query(self, query: str, queue: asyncio.Queue) -> int:
+        """Fetch one Reed search and queue its jobs"""
+        job_count = 0
+        params = dict(REED_PARAMS, keywords=query)
+        
+        try:
+            response = await self.client.get(REED_SEARCH_URL, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                
+                for job in data.get("results", []):
+                    job_dto = self._convert_reed_job(job)
+                    if job_dto:
+                        await queue.put(job_dto)
+                        job_count += 1
+                
+                logger.info(f"Reed API: {len(data.get('results', []))} jobs for '{query}'")
+            
+        except Exception as e:
+            logger.debug(f"Reed API error for {query}: {e}")
+        
+        return job_count
     
     def _convert_reed_job(self, job: Dict) -> JobDTO:
         """Convert Reed job to JobDTO"""
@@ -87,72 +158,71 @@ class ProductionJobFetcher:
             posted_date = None
             if job.get("date"):
                 try:
-                    posted_date = datetime.fromisoformat(job["date"].replace("Z", "+00:00"))
-                except:
+                    posted_date = datetime.fromisoformat(job["date"])
+                except (TypeError, ValueError):
                     posted_date = datetime.now()
             
             return JobDTO(
                 external_id=f"reed_{job.get('jobId', 'unknown')}",
                 source="reed_uk",
-                title=job.get("jobTitle", "Position"),
+                title=job.get("jobTitle") or "Position",
                 company=job.get("employerName", "Company"),
                 location=job.get("locationName", "London"),
-                description=job.get("jobDescription", ""),
+                description=job.get("jobDescription") or "",
                 salary_min=salary_min,
                 salary_max=salary_max,
                 job_type="Full-time",
                 posted_date=posted_date,
-                raw_data=job
+                raw_data=_without(job, "jobDescription")
             )
         except Exception as e:
             logger.debug(f"Error converting Reed job: {e}")
             return None
     
-    async def fetch_jobs_from_themuse_api(self) -> List[JobDTO]:
+    async def fetch_jobs_from_themuse_api(self, queue: asyncio.Queue) -> int:
         """Fetch jobs from The Muse API (US jobs, no auth required)"""
-        jobs = []
+        job_count = 0
         
         try:
             logger.info("Fetching from The Muse API...")
             
-            # The Muse API endpoint
-            categories = ["Software Engineer", "Data Science", "Product", "Design", "Marketing"]
-            
-            for category in categories:
-                for page in range(1, 6):  # 5 pages per category
-                    url = "https://www.themuse.com/api/public/jobs"
-                    params = {
-                        "category": category,
-                        "page": page,
-                        "descending": "true",
-                        "api_key": "public"
-                    }
-                    
-                    try:
-                        response = await self.client.get(url, params=params)
-                        if response.status_code == 200:
-                            data = response.json()
-                            
-                            for job in data.get("results", []):
-                                job_dto = self._convert_muse_job(job)
-                                if job_dto:
-                                    jobs.append(job_dto)
-                            
-                            if not data.get("results"):
-                                break
-                        
-                        await asyncio.sleep(0.5)  # Rate limiting
-                        
-                    except Exception as e:
-                        logger.debug(f"Muse API error for {category} page {page}: {e}")
-                        continue
+            job_count = await self._fetch_limited(
+                lambda category: self._fetch_muse_category(category, queue), MUSE_CATEGORIES
+            )
             
-            logger.info(f"Muse API total: {len(jobs)} jobs")
+            logger.info(f"Muse API total: {job_count} jobs")
             
         except Exception as e:
             logger.error(f"Muse API error: {e}")
         
-        return jobs
+        return job_count
+    
+    async def _fetch_muse_category(self, category: str, queue: asyncio.Queue) -> int:
+        """Fetch one Muse category page by page, stopping at the first empty page"""
+        job_count = 0
+        
+        for page in range(1, MUSE_PAGES_PER_CATEGORY + 1):
+            params = dict(MUSE_PARAMS, category=category, page=page)
+            
+            try:
+                response = await self.client.get(MUSE_JOBS_URL, params=params)
+                if response.status_code == 200:
+                    data = orjson.loads(response.content)
+                    
+                    for job in data.get("results", []):
+                        job_dto = self._convert_muse_job(job)
+                        if job_dto:
+                            await queue.put(job_dto)
+                            job_count += 1
+                    
+                    if not data.get("results"):
+                        break
+                
+            except Exception as e:
+                logger.debug(f"Muse API error for {category} page {page}: {e}")
+                continue
+        
+        return job_count
     
     def _convert_muse_job(self, job: Dict) -> JobDTO:
         """Convert Muse job to JobDTO"""
@@ -169,69 +239,65 @@ class ProductionJobFetcher:
             posted_date = None
             if job.get("publication_date"):
                 try:
-                    posted_date = datetime.fromisoformat(job["publication_date"].replace("Z", "+00:00"))
-                except:
+                    posted_date = datetime.fromisoformat(job["publication_date"])
+                except (TypeError, ValueError):
                     posted_date = datetime.now()
             
             return JobDTO(
                 external_id=f"muse_{job.get('id', 'unknown')}",
                 source="themuse",
-                title=job.get("name", "Position"),
+                title=job.get("name") or "Position",
                 company=company_name,
                 location=location,
-                description=job.get("contents", ""),
+                description=job.get("contents") or "",
                 job_type=job.get("type", "Full-time"),
                 posted_date=posted_date,
-                raw_data=job
+                raw_data=_without(job, "contents")
             )
         except Exception as e:
             logger.debug(f"Error converting Muse job: {e}")
             return None
     
-    async def fetch_jobs_from_jobs2careers_api(self) -> List[JobDTO]:
+    async def fetch_jobs_from_jobs2careers_api(self, queue: asyncio.Queue) -> int:
         """Fetch jobs from Jobs2Careers API (no auth required)"""
-        jobs = []
+        job_count = 0
         
         try:
             logger.info("Fetching from Jobs2Careers API...")
             
-            # Jobs2Careers API endpoint
-            queries = ["software+developer", "python+developer", "javascript+developer", 
-                      "data+engineer", "devops+engineer", "react+developer"]
-            
-            for query in queries:
-                url = "http://api.jobs2careers.com/api/spec.json"
-                params = {
-                    "q": query,
-                    "l": "remote",
-                    "start": 0,
-                    "limit": 50
-                }
-                
-                try:
-                    response = await self.client.get(url, params=params)
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        for job in data.get("jobs", []):
-                            job_dto = self._convert_jobs2careers_job(job)
-                            if job_dto:
-                                jobs.append(job_dto)
-                        
-                        logger.info(f"Jobs2Careers: {len(data.get('jobs', []))} jobs for '{query}'")
-                    
-                    await asyncio.sleep(1)  # Rate limiting
-                    
-                except Exception as e:
-                    logger.debug(f"Jobs2Careers API error for {query}: {e}")
-                    continue
+            job_count = await self._fetch_limited(
+                lambda query: self._fetch_jobs2careers_query(query, queue), J2C_QUERIES
+            )
             
-            logger.info(f"Jobs2Careers API total: {len(jobs)} jobs")
+            logger.info(f"Jobs2Careers API total: {job_count} jobs")
             
         except Exception as e:
             logger.error(f"Jobs2Careers API error: {e}")
         
-        return jobs
+        return job_count
+    
+    async def _fetch_jobs2careers_query(self, query: str, queue: asyncio.Queue) -> int:
+        """Fetch one Jobs2Careers search and queue its jobs"""
+        job_count = 0
+        params = dict(J2C_PARAMS, q=query)
+        
+        try:
+            response = await self.client.get(J2C_SEARCH_URL, params=params)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                
+                for job in data.get("jobs", []):
+                    job_dto = self._convert_jobs2careers_job(job)
+                    if job_dto:
+                        await queue.put(job_dto)
+                        job_count += 1
+                
+                logger.info(f"Jobs2Careers: {len(data.get('jobs', []))} jobs for '{query}'")
+            
+        except Exception as e:
+            logger.debug(f"Jobs2Careers API error for {query}: {e}")
+        
+        return job_count
     
     def _convert_jobs2careers_job(self, job: Dict) -> JobDTO:
         """Convert Jobs2Careers job to JobDTO"""
@@ -239,49 +305,33 @@ class ProductionJobFetcher:
             return JobDTO(
                 external_id=f"j2c_{job.get('id', 'unknown')}",
                 source="jobs2careers",
-                title=job.get("title", "Position"),
+                title=job.get("title") or "Position",
                 company=job.get("company", "Company"),
                 location=job.get("location", "Remote"),
-                description=job.get("description", ""),
+                description=job.get("description") or "",
                 job_type="Full-time",
                 posted_date=datetime.now(),
-                raw_data=job
+                raw_data=_without(job, "description")
             )
         except Exception as e:
             logger.debug(f"Error converting Jobs2Careers job: {e}")
             return None
     
-    async def fetch_github_jobs_archive(self) -> List[JobDTO]:
+    async def fetch_github_jobs_archive(self, queue: asyncio.Queue) -> int:
         """Fetch jobs from GitHub Jobs archive on GitHub"""
-        jobs = []
+        job_count = 0
         
         try:
             logger.info("Fetching from GitHub Jobs archive...")
             
-            # GitHub archive repositories
-            repos = [
-                "jsonresume/resume-schema",
-                "poteto/hiring-without-whiteboards",
-                "remoteintech/remote-jobs"
-            ]
+            titles = ARCHIVE_JOB_TITLES[:4]  # 4 jobs per company
             
-            # Generate realistic jobs based on actual GitHub companies
-            companies = [
-                "GitHub", "GitLab", "Automattic", "Shopify", "Zapier", "Buffer", 
-                "Basecamp", "InVision", "Doist", "Toggl", "Toptal", "Upwork",
-                "Auth0", "Algolia", "Netlify", "Vercel", "Cloudflare", "DigitalOcean",
-                "MongoDB", "Redis", "Elastic", "Confluent", "Databricks", "Snowflake"
-            ]
+            # Draw every posting age up front against a single "now"
+            now = datetime.now()
+            days_ago = iter(random.choices(range(1, 31), k=len(ARCHIVE_COMPANIES) * len(titles)))
             
-            job_titles = [
-                "Software Engineer", "Senior Software Engineer", "Staff Engineer",
-                "Frontend Developer", "Backend Developer", "Full Stack Developer",
-                "DevOps Engineer", "Site Reliability Engineer", "Data Engineer",
-                "Machine Learning Engineer", "Product Manager", "Engineering Manager"
-            ]
-            
-            for i, company in enumerate(companies):
-                for j, title in enumerate(job_titles[:4]):  # 4 jobs per company
+            for i, company in enumerate(ARCHIVE_COMPANIES):
+                for j, title in enumerate(titles):
                     job_dto = JobDTO(
                         external_id=f"github_archive_{company}_{i}_{j}",
                         source="github_archive",
@@ -290,121 +340,165 @@ class ProductionJobFetcher:
                         location="Remote",
                         description=f"Join {company} as a {title}. We're looking for talented engineers to work on cutting-edge technology. Remote-first culture with competitive benefits.",
                         job_type="Full-time",
-                        posted_date=datetime.now() - timedelta(days=random.randint(1, 30)),
+                        posted_date=now - timedelta(days=next(days_ago)),
                         raw_data={"archive": True, "company": company}
                     )
-                    jobs.append(job_dto)
+                    await queue.put(job_dto)
+                    job_count += 1
             
-            logger.info(f"GitHub archive: {len(jobs)} jobs")
+            logger.info(f"GitHub archive: {job_count} jobs")
             
         except Exception as e:
             logger.error(f"GitHub archive error: {e}")
         
-        return jobs
+        return job_count
     
-    async def fetch_all_production_jobs(self) -> List[JobDTO]:
-        """Fetch jobs from all sources concurrently"""
+    async def fetch_all_production_jobs(self, queue: asyncio.Queue) -> int:
+        """Fetch jobs from all sources concurrently, streaming them into queue.
+        
+        A None sentinel is queued once every source has finished.
+        """
         logger.info("Starting production job fetch from multiple sources...")
         
         # Run all fetchers concurrently
         tasks = [
-            self.fetch_jobs_from_reed_api(),
-            self.fetch_jobs_from_themuse_api(),
-            self.fetch_jobs_from_jobs2careers_api(),
-            self.fetch_github_jobs_archive(),
+            self.fetch_jobs_from_reed_api(queue),
+            self.fetch_jobs_from_themuse_api(queue),
+            self.fetch_jobs_from_jobs2careers_api(queue),
+            self.fetch_github_jobs_archive(queue),
         ]
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            await queue.put(None)
         
-        all_jobs = []
+        total_fetched = 0
         for result in results:
-            if isinstance(result, list):
-                all_jobs.extend(result)
+            if isinstance(result, int):
+                total_fetched += result
             else:
                 logger.error(f"Task failed: {result}")
         
-        # Remove duplicates based on external_id
-        seen_ids = set()
-        unique_jobs = []
-        for job in all_jobs:
-            if job.external_id not in seen_ids:
-                seen_ids.add(job.external_id)
-                unique_jobs.append(job)
-        
-        logger.info(f"Total unique jobs fetched: {len(unique_jobs)}")
-        return unique_jobs
+        logger.info(f"Total jobs fetched: {total_fetched}")
+        return total_fetched
     
     async def close(self):
         """Close the HTTP client"""
         await self.client.aclose()
 
 
+PRODUCTION_SOURCES = ["reed_uk", "themuse", "jobs2careers", "github_archive"]
+
+# Fetched jobs are ingested while fetching continues; the bounded queue makes
+# fast fetchers wait for the database instead of piling jobs up in memory
+JOB_QUEUE_SIZE = 500
+# Large batches mean few commits; the engine flushes up to 1000 rows per
+# multi-row INSERT (insertmanyvalues_page_size)
+INGEST_BATCH_SIZE = 500
+
+
+def clear_production_jobs(db):
+    """Delete previously loaded production jobs and their skills"""
+    # Delete related job_skills first, in one statement
+    db.execute(text("""
+        DELETE FROM job_skills
+        WHERE job_id IN (SELECT id FROM job_postings WHERE source = ANY(:sources))
+    """), {"sources": PRODUCTION_SOURCES})
+    
+    db.query(JobPosting).filter(
+        JobPosting.source.in_(PRODUCTION_SOURCES)
+    ).delete()
+    db.commit()
+
+
+async def ingest_from_queue(queue: asyncio.Queue, db) -> Tuple[int, int]:
+    """Ingest queued jobs in batches until the None sentinel arrives.
+    
+    Existing production jobs are cleared just before the first batch, so a
+    run that fetches nothing leaves the database untouched. Batches load
+    one at a time on db. Returns the number of unique jobs received and the
+    number successfully loaded.
+    """
+    ingestion_service = JobIngestionService(db)
+    seen_ids = set()
+    batch = []
+    batch_number = 0
+    total_success = 0
+    
+    while True:
+        job = await queue.get()
+        
+        if job is not None:
+            # Remove duplicates based on external_id
+            if job.external_id in seen_ids:
+                continue
+            seen_ids.add(job.external_id)
+            batch.append(job)
+            if len(batch) < INGEST_BATCH_SIZE:
+                continue
+        
+        if batch:
+            batch_number += 1
+            if batch_number == 1:
+                logger.info("Clearing existing production jobs...")
+                await asyncio.to_thread(clear_production_jobs, db)
+            
+            logger.info(f"Processing batch {batch_number}")
+            
+            # The DB driver is synchronous; run it off the event loop so
+            # fetching keeps going meanwhile. A single writer keeps batches
+            # from racing on shared skill rows.
+            success_count, fail_count = await asyncio.to_thread(ingestion_service.ingest_jobs_batch, batch)
+            total_success += success_count
+            
+            if fail_count > 0:
+                logger.warning(f"Batch had {fail_count} failures")
+            batch = []
+        
+        if job is None:
+            return len(seen_ids), total_success
+
+
 async def main():
     """Main function to fetch production jobs"""
     db = SessionLocal()
     fetcher = ProductionJobFetcher()
+    queue = asyncio.Queue(maxsize=JOB_QUEUE_SIZE)
     
     try:
-        # Fetch jobs from all sources
-        jobs = await fetcher.fetch_all_production_jobs()
+        # Fetch jobs from all sources while ingesting them
+        consumer = asyncio.create_task(ingest_from_queue(queue, db))
+        producer = asyncio.create_task(fetcher.fetch_all_production_jobs(queue))
         
-        if not jobs:
+        try:
+            unique_count, total_success = await consumer
+        except BaseException:
+            producer.cancel()
+            raise
+        await producer
+        
+        if not unique_count:
             logger.error("No production jobs fetched!")
             return
         
-        logger.info(f"Loading {len(jobs)} production jobs into database...")
-        
-        # Clear existing production jobs
-        from src.models.job import JobPosting
-        from src.models.skill import JobSkill
-        
-        logger.info("Clearing existing production jobs...")
-        production_sources = ["reed_uk", "themuse", "jobs2careers", "github_archive"]
-        
-        existing_jobs = db.query(JobPosting).filter(
-            JobPosting.source.in_(production_sources)
-        ).all()
-        
-        for job in existing_jobs:
-            db.query(JobSkill).filter(JobSkill.job_id == job.id).delete()
-        
-        db.query(JobPosting).filter(
-            JobPosting.source.in_(production_sources)
-        ).delete()
-        db.commit()
-        
-        # Ingest new jobs in batches
-        ingestion_service = JobIngestionService(db)
-        
-        batch_size = 50
-        total_success = 0
-        
-        for i in range(0, len(jobs), batch_size):
-            batch = jobs[i:i + batch_size]
-            logger.info(f"Processing batch {i//batch_size + 1}/{(len(jobs) + batch_size - 1)//batch_size}")
-            
-            success_count, fail_count = ingestion_service.ingest_jobs_batch(batch)
-            total_success += success_count
-            
-            if fail_count > 0:
-                logger.warning(f"Batch had {fail_count} failures")
-        
+        logger.info(f"Total unique jobs fetched: {unique_count}")
         logger.info(f"Production job loading complete!")
         logger.info(f"Successfully loaded: {total_success} jobs")
         
         # Final statistics
-        total_jobs = db.query(JobPosting).count()
-        active_jobs = db.query(JobPosting).filter(JobPosting.is_active == 1).count()
+        total_jobs, active_jobs = db.query(
+            func.count(JobPosting.id),
+            func.count(JobPosting.id).filter(JobPosting.is_active == 1),
+        ).one()
         
         logger.info(f"Total jobs in database: {total_jobs}")
         logger.info(f"Active jobs: {active_jobs}")
         
         # Show jobs by source
-        sources = db.query(JobPosting.source).distinct().all()
         logger.info("Jobs by source:")
-        for source in sources:
-            count = db.query(JobPosting).filter(JobPosting.source == source[0]).count()
-            logger.info(f"  {source[0]}: {count} jobs")
+        for source, count in db.query(JobPosting.source, func.count(JobPosting.id)).group_by(JobPosting.source).all():
+            logger.info(f"  {source}: {count} jobs")
         
     except Exception as e:
         logger.error(f"Error in production job fetch: {e}")
@@ -416,4 +510,6 @@ async def main():
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
\ No newline at end of file
@@ -5,23 +5,100 @@ Fetch real job data from Adzuna API and ingest into database
 """
 import os
 import sys
-import json
+import orjson
 import logging
-import time
+import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-import requests
+import httpx
+from sqlalchemy import text
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.db.database import SessionLocal
 from src.schemas.ingestion import JobDTO
+from src.models.job import JobPosting
 from src.services.job_ingestion import JobIngestionService
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.rate_limiter import ADZUNA_REQUESTS_PER_MINUTE, AsyncTokenBucket, get_with_retries
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Queries run concurrently but share one ADZUNA_REQUESTS_PER_MINUTE bucket
+MAX_CONCURRENT_QUERIES = 5
+
+# Throttled or failed responses are retried, after Retry-After when given
+# and with exponential backoff otherwise
+RETRY_STATUSES = (429, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+
+# Search queries to get 2000 jobs
+ADZUNA_QUERIES = (
+    "software engineer",
+    "python developer",
+    "javascript developer",
+    "data engineer",
+    "devops engineer",
+    "full stack developer",
+    "backend developer",
+    "frontend developer",
+    "machine learning engineer",
+    "cloud engineer",
+    "mobile developer",
+    "web developer",
+    "java developer",
+    "react developer",
+    "node developer",
+    "aws engineer",
+    "senior developer",
+    "junior developer",
+    "software developer",
+    "technical lead",
+)
+
+# Technical skills - expanded list
+TECH_SKILLS = (
+    "python", "javascript", "java", "c++", "c#", "go", "rust", "php", "ruby", "scala", "kotlin",
+    "react", "angular", "vue", "node.js", "django", "flask", "spring", "express", "fastapi",
+    "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins",
+    "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
+    "git", "gitlab", "github", "bitbucket", "jira", "confluence", "slack",
+    "linux", "unix", "windows", "bash", "powershell", "shell", "scripting",
+    "html", "css", "typescript", "graphql", "rest", "api", "grpc", "websocket",
+    "machine learning", "ai", "data science", "pandas", "numpy", "tensorflow", "pytorch",
+    "agile", "scrum", "devops", "ci/cd", "microservices", "serverless", "lambda",
+    "react native", "flutter", "swift", "kotlin", "ios", "android", "mobile",
+    "spark", "hadoop", "kafka", "airflow", "databricks", "snowflake", "bigquery",
+    "tableau", "powerbi", "looker", "grafana", "prometheus", "datadog",
+    "selenium", "cypress", "jest", "mocha", "junit", "pytest",
+    "oauth", "jwt", "ssl", "security", "encryption", "authentication",
+    ".net", "asp.net", "blazor", "xamarin", "unity", "unreal",
+    "salesforce", "sap", "oracle", "servicenow", "workday",
+    "blockchain", "ethereum", "solidity", "web3", "crypto",
+    "figma", "sketch", "adobe", "ux", "ui", "design"
+)
+
+# One automaton scans a description once for every skill above
+TECH_SKILL_MATCHER = KeywordMatcher({skill: [skill] for skill in TECH_SKILLS})
+
+# Fetched jobs are ingested while fetching continues; the bounded queue makes
+# fetchers wait for the database instead of piling jobs up in memory
+JOB_QUEUE_SIZE = 500
+# Large batches mean few commits; the engine flushes up to 1000 rows per
+# multi-row INSERT (insertmanyvalues_page_size)
+INGEST_BATCH_SIZE = 500
+
+# Adzuna fields kept in raw_data; everything else is already stored in columns
+RAW_DATA_FIELDS = ("redirect_url", "adref", "category")
+
 class AdzunaAPIFetcher:
     """Fetch jobs from Adzuna API"""
     
@@ -31,135 +108,121 @@ class AdzunaAPIFetcher:
         self.base_url = "https://api.adzuna.com/v1/api"
         self.country = "us"
         self.max_pages = 10  # 10 × 50 = 500 results per query
-        
-    def fetch_jobs_page(self, page: int, query: str = "software engineer") -> List[Dict]:
-        """Fetch a single page of jobs from Adzuna API"""
-        url = f"{self.base_url}/jobs/{self.country}/search/{page}"
-        
-        params = {
+        self.client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAX_CONCURRENT_QUERIES,
+                max_keepalive_connections=MAX_CONCURRENT_QUERIES,
+            ),
+            timeout=30,
+        )
+        self.rate_limiter = AsyncTokenBucket(ADZUNA_REQUESTS_PER_MINUTE, per=60, capacity=1)
+        self._base_params = {
             "app_id": self.app_id,
             "app_key": self.app_key,
             "results_per_page": 50,
-            "what": query,
             "content-type": "application/json",
         }
         
+    async def fetch_jobs_page(self, page: int, query: str = "software engineer") -> List[Dict]:
+        """Fetch a single page of jobs from Adzuna API"""
+        url = f"{self.base_url}/jobs/{self.country}/search/{page}"
+        
+        params = dict(self._base_params, what=query)
+        
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await get_with_retries(
+                self.client, self.rate_limiter, url, params,
+                retry_statuses=RETRY_STATUSES, max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY,
+            )
+            
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             jobs = data.get("results", [])
             
-            # Log rate limit info if available
-            if "X-RateLimit-Remaining" in response.headers:
-                remaining = response.headers["X-RateLimit-Remaining"]
-                logger.info(f"Rate limit remaining: {remaining}")
-            
             logger.info(f"Fetched {len(jobs)} jobs from page {page}")
             return jobs
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching page {page}: {e}")
             return []
     
-    def fetch_all_jobs(self, queries: List[str]) -> List[JobDTO]:
-        """Fetch jobs for multiple queries"""
-        all_jobs = []
-        seen_job_ids = set()  # Track unique job IDs to avoid duplicates
-        total_queries = len(queries)
-        
-        for idx, query in enumerate(queries, 1):
-            logger.info(f"[{idx}/{total_queries}] Fetching jobs for query: {query}")
-            query_job_count = 0
-            
+    async def fetch_query_pages(self, semaphore: asyncio.Semaphore, query: str,
+                                queue: asyncio.Queue) -> int:
+        """Fetch pages for one query in order, queueing converted jobs as each page arrives"""
+        query_job_count = 0
+        async with semaphore:
             for page in range(1, self.max_pages + 1):
-                jobs = self.fetch_jobs_page(page, query)
+                jobs = await self.fetch_jobs_page(page, query)
                 
                 if not jobs:
                     logger.info(f"No more jobs for '{query}' at page {page}")
                     break
                 
                 for job_data in jobs:
-                    job_id = str(job_data.get("id", ""))
-                    
-                    # Skip duplicates
-                    if job_id in seen_job_ids:
-                        continue
-                    
-                    seen_job_ids.add(job_id)
                     job_dto = self.convert_to_job_dto(job_data)
                     if job_dto:
-                        all_jobs.append(job_dto)
+                        await queue.put(job_dto)
                         query_job_count += 1
-                
-                # Rate limiting: stay under 25 requests per minute
-                time.sleep(2.5)  # 2.5 seconds between requests = 24 req/min
-            
-            logger.info(f"Query '{query}' yielded {query_job_count} unique jobs. Total so far: {len(all_jobs)}")
-            
-            # Extra delay between queries
-            time.sleep(5)
         
-        logger.info(f"Total unique jobs fetched: {len(all_jobs)}")
-        return all_jobs
+        logger.info(f"Query '{query}' yielded {query_job_count} jobs")
+        return query_job_count
+    
+    async def fetch_all_jobs(self, queries: List[str], queue: asyncio.Queue) -> int:
+        """Fetch jobs for multiple queries concurrently, streaming them into queue.
+        
+        A None sentinel is queued once every query has finished.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        try:
+            results = await asyncio.gather(*[
+                self.fetch_query_pages(semaphore, query, queue) for query in queries
+            ])
+        finally:
+            await queue.put(None)
+        
+        logger.info(f"Total jobs fetched: {sum(results)}")
+        return sum(results)
+    
+    async def close(self):
+        """Close the HTTP client"""
+        await self.client.aclose()
     
     def convert_to_job_dto(self, job_data: Dict) -> Optional[JobDTO]:
         """Convert Adzuna job data to JobDTO"""
         try:
-            # Extract basic info
-            job_id = str(job_data.get("id", ""))
-            title = job_data.get("title", "")[:255]
-            company = ""
-            
-            # Extract company name
-            if "company" in job_data and job_data["company"]:
-                company = job_data["company"].get("display_name", "")
-            
-            # Extract location
-            location = "Remote"
-            if "location" in job_data and job_data["location"]:
-                location = job_data["location"].get("display_name", "Remote")
+            get = job_data.get
             
-            # Extract description
-            description = job_data.get("description", "")
-            
-            # Extract salary
-            salary_min = job_data.get("salary_min")
-            salary_max = job_data.get("salary_max")
+            # Extract basic info
+            job_id = str(get("id", ""))
+            title = (get("title") or "")[:255]
+            description = get("description") or ""
+            company = company_info.get("display_name", "") if (company_info := get("company")) else ""
+            location = location_info.get("display_name", "Remote") if (location_info := get("location")) else "Remote"
             
             # Convert salary to float if present
-            if salary_min:
-                salary_min = float(salary_min)
-            if salary_max:
-                salary_max = float(salary_max)
+            salary_min = float(value) if (value := get("salary_min")) is not None else None
+            salary_max = float(value) if (value := get("salary_max")) is not None else None
             
             # Extract date
             posted_date = None
-            if job_data.get("created"):
+            if created := get("created"):
                 try:
-                    posted_date = datetime.fromisoformat(job_data["created"].replace('Z', '+00:00'))
-                except:
+                    posted_date = datetime.fromisoformat(created)
+                except (TypeError, ValueError):
                     posted_date = datetime.now()
             
-            # Extract category from job_data
-            category = None
-            if "category" in job_data and job_data["category"]:
-                if isinstance(job_data["category"], dict):
-                    category = job_data["category"].get("label") or job_data["category"].get("tag")
-                elif isinstance(job_data["category"], str):
-                    category = job_data["category"]
-            
-            # Clean category
+            # Extract category label (or tag), trimmed to the column size
+            category = get("category")
+            if isinstance(category, dict):
+                category = category.get("label") or category.get("tag")
+            elif not isinstance(category, str):
+                category = None
             if category:
-                category = str(category).strip()
-                if len(category) > 100:
-                    category = category[:100]
+                category = str(category).strip()[:100]
             
-            # Extract skills from description
-            extracted_skills = self.extract_skills_from_description(description)
-            
-            return JobDTO(
+            job_dto = JobDTO(
                 external_id=f"adzuna_{job_id}",
                 source="adzuna",
                 title=title,
@@ -171,53 +234,83 @@ class AdzunaAPIFetcher:
                 job_type="Full-time",
                 category=category,
                 posted_date=posted_date,
-                extracted_skills=extracted_skills,
-                raw_data=job_data
+                raw_data={key: job_data[key] for key in RAW_DATA_FIELDS if key in job_data}
             )
             
+            # Extract skills from the DTO's cached lowercased description
+            job_dto.extracted_skills = self.extract_skills_from_description(job_dto.description_lower)
+            return job_dto
+            
         except Exception as e:
             logger.error(f"Error converting job data: {e}")
             return None
     
-    def extract_skills_from_description(self, description: str) -> List[str]:
-        """Extract skills from job description"""
-        if not description:
+    def extract_skills_from_description(self, description_lower: str) -> List[str]:
+        """Extract skills from an already lowercased job description"""
+        if not description_lower:
             return []
         
-        # Common tech skills to look for
-        skills = []
-        description_lower = description.lower()
+        return [skill.title() for skill in TECH_SKILL_MATCHER.find_ordered(description_lower)]
+
+def clear_adzuna_jobs(db):
+    """Delete previously loaded Adzuna jobs and their skills"""
+    # Delete related job_skills first, in one statement
+    db.execute(text("""
+        DELETE FROM job_skills
+        WHERE job_id IN (SELECT id FROM job_postings WHERE source = :source)
+    """), {"source": "adzuna"})
+    
+    db.query(JobPosting).filter(
+        JobPosting.source == "adzuna"
+    ).delete()
+    db.commit()
+
+
+async def ingest_from_queue(queue: asyncio.Queue, db) -> Tuple[int, int, int]:
+    """Ingest queued jobs in batches until the None sentinel arrives.
+    
+    Existing Adzuna jobs are cleared just before the first batch, so a run
+    that fetches nothing leaves the database untouched. Batches load one at
+    a time on db. Returns the number of unique jobs received, loaded and
+    failed.
+    """
+    ingestion_service = JobIngestionService(db)
+    seen_ids = set()  # Track unique job IDs to avoid duplicates
+    batch = []
+    cleared = False
+    success_count = fail_count = 0
+    
+    while True:
+        job = await queue.get()
         
-        # Technical skills - expanded list
-        tech_skills = [
-            "python", "javascript", "java", "c++", "c#", "go", "rust", "php", "ruby", "scala", "kotlin",
-            "react", "angular", "vue", "node.js", "django", "flask", "spring", "express", "fastapi",
-            "aws", "azure", "gcp", "docker", "kubernetes", "terraform", "ansible", "jenkins",
-            "postgresql", "mysql", "mongodb", "redis", "elasticsearch", "cassandra", "dynamodb",
-            "git", "gitlab", "github", "bitbucket", "jira", "confluence", "slack",
-            "linux", "unix", "windows", "bash", "powershell", "shell", "scripting",
-            "html", "css", "typescript", "graphql", "rest", "api", "grpc", "websocket",
-            "machine learning", "ai", "data science", "pandas", "numpy", "tensorflow", "pytorch",
-            "agile", "scrum", "devops", "ci/cd", "microservices", "serverless", "lambda",
-            "react native", "flutter", "swift", "kotlin", "ios", "android", "mobile",
-            "spark", "hadoop", "kafka", "airflow", "databricks", "snowflake", "bigquery",
-            "tableau", "powerbi", "looker", "grafana", "prometheus", "datadog",
-            "selenium", "cypress", "jest", "mocha", "junit", "pytest",
-            "oauth", "jwt", "ssl", "security", "encryption", "authentication",
-            ".net", "asp.net", "blazor", "xamarin", "unity", "unreal",
-            "salesforce", "sap", "oracle", "servicenow", "workday",
-            "blockchain", "ethereum", "solidity", "web3", "crypto",
-            "figma", "sketch", "adobe", "ux", "ui", "design"
-        ]
+        if job is not None:
+            # Skip duplicates
+            if job.external_id in seen_ids:
+                continue
+            seen_ids.add(job.external_id)
+            batch.append(job)
+            if len(batch) < INGEST_BATCH_SIZE:
+                continue
         
-        for skill in tech_skills:
-            if skill in description_lower:
-                skills.append(skill.title())
+        if batch:
+            if not cleared:
+                await asyncio.to_thread(clear_adzuna_jobs, db)
+                logger.info("Cleared existing Adzuna jobs")
+                cleared = True
+            
+            # The DB driver is synchronous; run it off the event loop so
+            # fetching keeps going meanwhile. A single writer keeps batches
+            # from racing on shared skill rows.
+            batch_success, batch_fail = await asyncio.to_thread(ingestion_service.ingest_jobs_batch, batch)
+            success_count += batch_success
+            fail_count += batch_fail
+            batch = []
         
-        return skills
+        if job is None:
+            return len(seen_ids), success_count, fail_count
 
 
-def main():
+async def main():
     """Main function to fetch and ingest Adzuna jobs"""
     try:
         # Load environment variables
@@ -226,66 +319,27 @@ def main():
         
         fetcher = AdzunaAPIFetcher()
         
-        # Define search queries to get 2000 jobs
-        queries = [
-            "software engineer",
-            "python developer", 
-            "javascript developer",
-            "data engineer",
-            "devops engineer",
-            "full stack developer",
-            "backend developer",
-            "frontend developer",
-            "machine learning engineer",
-            "cloud engineer",
-            "mobile developer",
-            "web developer",
-            "java developer",
-            "react developer",
-            "node developer",
-            "aws engineer",
-            "senior developer",
-            "junior developer",
-            "software developer",
-            "technical lead"
-        ]
-        
-        # Fetch jobs
+        # Fetch jobs while ingesting them
         logger.info("Starting Adzuna job ingestion...")
-        jobs = fetcher.fetch_all_jobs(queries)
-        
-        if not jobs:
-            logger.warning("No jobs fetched from Adzuna API")
-            return
-        
-        logger.info(f"Fetched {len(jobs)} jobs from Adzuna API")
-        
-        # Connect to database
         db = SessionLocal()
+        queue = asyncio.Queue(maxsize=JOB_QUEUE_SIZE)
         
         try:
-            # Clear existing Adzuna jobs
-            from src.models.job import JobPosting
-            from src.models.skill import JobSkill
-            
-            existing_jobs = db.query(JobPosting).filter(
-                JobPosting.source == "adzuna"
-            ).all()
-            
-            for job in existing_jobs:
-                db.query(JobSkill).filter(JobSkill.job_id == job.id).delete()
-            
-            db.query(JobPosting).filter(
-                JobPosting.source == "adzuna"
-            ).delete()
-            db.commit()
+            consumer = asyncio.create_task(ingest_from_queue(queue, db))
+            producer = asyncio.create_task(fetcher.fetch_all_jobs(ADZUNA_QUERIES, queue))
             
-            logger.info("Cleared existing Adzuna jobs")
+            try:
+                unique_count, success_count, fail_count = await consumer
+            except BaseException:
+                producer.cancel()
+                raise
+            await producer
             
-            # Ingest new jobs
-            ingestion_service = JobIngestionService(db)
-            success_count, fail_count = ingestion_service.ingest_jobs_batch(jobs)
+            if not unique_count:
+                logger.warning("No jobs fetched from Adzuna API")
+                return
             
+            logger.info(f"Fetched {unique_count} unique jobs from Adzuna API")
             logger.info(f"Adzuna job ingestion complete!")
             logger.info(f"Successfully loaded: {success_count}")
             logger.info(f"Failed: {fail_count}")
@@ -298,6 +352,7 @@ def main():
             logger.error(f"Database error: {e}")
             db.rollback()
         finally:
+            await fetcher.close()
             db.close()
             
     except Exception as e:
@@ -306,4 +361,6 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(main())
\ No newline at end of file
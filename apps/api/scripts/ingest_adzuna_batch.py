@@ -1,27 +1,131 @@
 #!/usr/bin/env python3
 """
 Adzuna API Integration - Batch Processing to Prevent Timeouts
-Saves jobs to database after each query to prevent data loss
+Saves jobs to database every few queries to prevent data loss
 """
 import os
 import sys
-import json
+import orjson
 import logging
-import time
+import asyncio
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-import requests
+import httpx
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.db.database import SessionLocal
 from src.schemas.ingestion import JobDTO
 from src.services.job_ingestion import JobIngestionService
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.rate_limiter import ADZUNA_REQUESTS_PER_MINUTE, AsyncTokenBucket, get_with_retries
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Queries run concurrently but share one ADZUNA_REQUESTS_PER_MINUTE bucket
+MAX_CONCURRENT_QUERIES = 5
+
+# Throttled or unavailable responses are retried with exponential backoff
+RETRY_STATUSES = (429, 503)
+MAX_RETRIES = 5
+RETRY_BASE_DELAY = 1.0
+CONNECT_RETRIES = 3
+
+RESULTS_PER_PAGE = 50
+
+# Jobs from several queries are saved together, one commit per batch
+SAVE_BATCH_SIZE = 250
+
+# Stop starting new queries once this many jobs have been saved
+TARGET_JOB_COUNT = 1500
+
+# Comprehensive job searches across different industries: (query, category, pages)
+DIVERSE_SEARCHES = (
+    # Tech jobs (reduced scope)
+    ("software engineer", "it-jobs", 2),
+    ("data analyst", "it-jobs", 2),
+    ("web developer", "it-jobs", 2),
+    
+    # Healthcare
+    ("nurse", "healthcare-nursing-jobs", 3),
+    ("doctor", "healthcare-nursing-jobs", 2),
+    ("medical assistant", "healthcare-nursing-jobs", 2),
+    ("pharmacist", "healthcare-nursing-jobs", 2),
+    
+    # Education
+    ("teacher", "teaching-jobs", 3),
+    ("professor", "teaching-jobs", 2),
+    ("tutor", "teaching-jobs", 2),
+    
+    # Business & Finance
+    ("accountant", "accounting-finance-jobs", 3),
+    ("financial analyst", "accounting-finance-jobs", 2),
+    ("business analyst", "accounting-finance-jobs", 2),
+    ("project manager", "accounting-finance-jobs", 2),
+    
+    # Sales & Marketing
+    ("sales representative", "sales-jobs", 3),
+    ("marketing manager", "pr-advertising-marketing-jobs", 2),
+    ("digital marketing", "pr-advertising-marketing-jobs", 2),
+    
+    # Engineering (non-software)
+    ("mechanical engineer", "engineering-jobs", 2),
+    ("civil engineer", "engineering-jobs", 2),
+    ("electrical engineer", "engineering-jobs", 2),
+    
+    # Customer Service & Retail
+    ("customer service", "customer-services-jobs", 2),
+    ("retail manager", "retail-jobs", 2),
+    
+    # HR & Legal
+    ("hr manager", "hr-jobs", 2),
+    ("lawyer", "legal-jobs", 2),
+    
+    # Hospitality
+    ("hotel manager", "hospitality-catering-jobs", 2),
+    ("chef", "hospitality-catering-jobs", 2),
+    
+    # Admin & Operations
+    ("administrative assistant", "admin-jobs", 2),
+    ("operations manager", "logistics-warehouse-jobs", 2),
+)
+
+# Adzuna fields kept in raw_data; everything else is already stored in columns
+RAW_DATA_FIELDS = ("redirect_url", "adref", "category")
+
+# Common skills across industries
+SKILL_KEYWORDS = (
+    # Tech skills
+    "python", "javascript", "java", "sql", "excel", "powerpoint", "word",
+    "react", "angular", "vue", "node.js", "django", "flask", "html", "css",
+    "aws", "azure", "docker", "kubernetes", "git", "linux", "windows",
+    "mysql", "postgresql", "mongodb", "redis", "data analysis", "machine learning",
+    
+    # Healthcare skills
+    "patient care", "medical records", "hipaa", "clinical", "nursing",
+    "emergency care", "medical billing", "pharmacy", "diagnosis",
+    
+    # Education skills
+    "curriculum", "lesson planning", "classroom management", "assessment",
+    "student engagement", "educational technology", "grading",
+    
+    # Business skills
+    "project management", "budgeting", "forecasting", "financial analysis",
+    "accounting", "quickbooks", "sap", "oracle", "salesforce",
+    "lead generation", "crm", "cold calling", "negotiation", "closing",
+    "social media", "seo", "content marketing", "google ads",
+    
+    # General professional skills
+    "leadership", "teamwork", "communication", "problem solving",
+    "time management", "organization", "customer service", "training"
+)
+
+# One automaton scans a job once for every keyword; whole words only, so
+# "java" doesn't match inside "javascript"
+SKILL_MATCHER = KeywordMatcher({skill: [skill] for skill in SKILL_KEYWORDS}, whole_words=True)
+
 class AdzunaBatchFetcher:
     """Fetch diverse jobs from Adzuna API with incremental saves"""
     
@@ -31,15 +135,37 @@ class AdzunaBatchFetcher:
         self.base_url = "https://api.adzuna.com/v1/api"
         self.country = "us"
         self.max_pages = 3  # Reduced to prevent timeouts
+        # One pooled HTTP/2 client for the whole run; httpx already asks for
+        # gzip. The transport retries failed connection attempts, while
+        # throttled responses are retried in fetch_jobs_page.
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENT_QUERIES,
+                    max_keepalive_connections=MAX_CONCURRENT_QUERIES,
+                    keepalive_expiry=60,
+                ),
+                retries=CONNECT_RETRIES,
+            ),
+            timeout=httpx.Timeout(30, connect=10),
+        )
+        self.rate_limiter = AsyncTokenBucket(ADZUNA_REQUESTS_PER_MINUTE, per=60, capacity=1)
+        self.total_saved = 0
+        # Jobs from finished queries waiting for the next save
+        self.pending_jobs: List[JobDTO] = []
+        # Adzuna IDs seen by any query this run; overlapping queries often
+        # return the same job
+        self.seen_job_ids = set()
         
-    def fetch_jobs_page(self, page: int, query: str = "", category: str = None) -> List[Dict]:
+    async def fetch_jobs_page(self, page: int, query: str = "", category: str = None) -> List[Dict]:
         """Fetch a single page of jobs from Adzuna API"""
         url = f"{self.base_url}/jobs/{self.country}/search/{page}"
         
         params = {
             "app_id": self.app_id,
             "app_key": self.app_key,
-            "results_per_page": 50,
+            "results_per_page": RESULTS_PER_PAGE,
             "content-type": "application/json",
         }
         
@@ -50,53 +176,50 @@ class AdzunaBatchFetcher:
             params["category"] = category
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await get_with_retries(
+                self.client, self.rate_limiter, url, params,
+                retry_statuses=RETRY_STATUSES, max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY,
+            )
+            
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             jobs = data.get("results", [])
             
             logger.info(f"Fetched {len(jobs)} jobs from page {page} (query: '{query}', category: '{category}')")
             return jobs
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching page {page}: {e}")
             return []
     
+    async def close(self):
+        """Close the HTTP client"""
+        await self.client.aclose()
+    
     def convert_to_job_dto(self, job_data: Dict) -> Optional[JobDTO]:
         """Convert Adzuna job data to JobDTO"""
         try:
-            job_id = str(job_data.get("id", ""))
-            title = job_data.get("title", "")[:255]
-            company = ""
+            get = job_data.get
             
-            if "company" in job_data and job_data["company"]:
-                company = job_data["company"].get("display_name", "")
+            job_id = str(get("id", ""))
+            title = (get("title") or "")[:255]
+            description = get("description") or ""
+            company = company_info.get("display_name", "") if (company_info := get("company")) else ""
+            location = location_info.get("display_name", "Remote") if (location_info := get("location")) else "Remote"
             
-            location = "Remote"
-            if "location" in job_data and job_data["location"]:
-                location = job_data["location"].get("display_name", "Remote")
-            
-            description = job_data.get("description", "")
-            
-            salary_min = job_data.get("salary_min")
-            salary_max = job_data.get("salary_max")
-            
-            if salary_min:
-                salary_min = float(salary_min)
-            if salary_max:
-                salary_max = float(salary_max)
+            salary_min = float(value) if (value := get("salary_min")) is not None else None
+            salary_max = float(value) if (value := get("salary_max")) is not None else None
             
+            # fromisoformat accepts the trailing Z natively on Python 3.11+
             posted_date = None
-            if job_data.get("created"):
+            if created := get("created"):
                 try:
-                    posted_date = datetime.fromisoformat(job_data["created"].replace('Z', '+00:00'))
-                except:
+                    posted_date = datetime.fromisoformat(created)
+                except (TypeError, ValueError):
                     posted_date = datetime.now()
             
-            # Extract skills from job description
-            extracted_skills = self.extract_skills_from_job(title, description)
-            
+            # Skills are extracted per query afterwards, see extract_skills_for_jobs
             return JobDTO(
                 external_id=f"adzuna_{job_id}",
                 source="adzuna_diverse",
@@ -108,204 +231,131 @@ class AdzunaBatchFetcher:
                 salary_max=salary_max,
                 job_type="Full-time",
                 posted_date=posted_date,
-                extracted_skills=extracted_skills,
-                raw_data=job_data
+                raw_data={key: job_data[key] for key in RAW_DATA_FIELDS if key in job_data}
             )
             
         except Exception as e:
             logger.error(f"Error converting job data: {e}")
             return None
     
-    def extract_skills_from_job(self, title: str, description: str) -> List[str]:
-        """Extract skills from job title and description"""
-        skills = []
-        text = f"{title} {description}".lower()
-        
-        # Common skills across industries
-        skill_keywords = [
-            # Tech skills
-            "python", "javascript", "java", "sql", "excel", "powerpoint", "word",
-            "react", "angular", "vue", "node.js", "django", "flask", "html", "css",
-            "aws", "azure", "docker", "kubernetes", "git", "linux", "windows",
-            "mysql", "postgresql", "mongodb", "redis", "data analysis", "machine learning",
-            
-            # Healthcare skills
-            "patient care", "medical records", "hipaa", "clinical", "nursing",
-            "emergency care", "medical billing", "pharmacy", "diagnosis",
-            
-            # Education skills
-            "curriculum", "lesson planning", "classroom management", "assessment",
-            "student engagement", "educational technology", "grading",
-            
-            # Business skills
-            "project management", "budgeting", "forecasting", "financial analysis",
-            "accounting", "quickbooks", "sap", "oracle", "salesforce",
-            "lead generation", "crm", "cold calling", "negotiation", "closing",
-            "social media", "seo", "content marketing", "google ads",
-            
-            # General professional skills
-            "leadership", "teamwork", "communication", "problem solving",
-            "time management", "organization", "customer service", "training"
-        ]
-        
-        # Check for skills in text
-        for skill in skill_keywords:
-            if skill in text:
-                skills.append(skill.title())
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_skills = []
-        for skill in skills:
-            if skill not in seen:
-                seen.add(skill)
-                unique_skills.append(skill)
-        
-        return unique_skills[:10]  # Limit to 10 skills per job
+    def extract_skills_for_jobs(self, jobs: List[JobDTO]):
+        """Fill in extracted_skills for a query's jobs in one pass once fetching is done"""
+        extract = self.extract_skills_from_job
+        for job_dto in jobs:
+            job_dto.extracted_skills = extract(job_dto.search_text)
     
-    def fetch_and_save_query_jobs(self, query: str, category: str, pages: int, db_session, ingestion_service) -> int:
-        """Fetch jobs for a single query and save immediately"""
+    def extract_skills_from_job(self, text: str) -> List[str]:
+        """Extract skills from a job's lowercased title and description (JobDTO.search_text)"""
+        skills = [skill.title() for skill in SKILL_MATCHER.find_ordered(text)]
+        return skills[:10]  # Limit to 10 skills per job
+    
+    async def fetch_query_jobs(self, semaphore: asyncio.Semaphore, query: str,
+                               category: str, pages: int) -> Tuple[str, List[JobDTO]]:
+        """Fetch and convert jobs for a single query; saving is left to the caller"""
         query_jobs = []
-        seen_job_ids = set()
-        
-        logger.info(f"Fetching '{query}' in category '{category}' ({pages} pages)")
         
-        for page in range(1, pages + 1):
-            jobs = self.fetch_jobs_page(page, query, category)
+        async with semaphore:
+            if self.reached_target():
+                return query, query_jobs
             
-            if not jobs:
-                break
+            logger.info(f"Fetching '{query}' in category '{category}' ({pages} pages)")
             
-            for job_data in jobs:
-                job_id = str(job_data.get("id", ""))
-                
-                if job_id in seen_job_ids:
-                    continue
-                
-                seen_job_ids.add(job_id)
-                job_dto = self.convert_to_job_dto(job_data)
-                if job_dto:
-                    query_jobs.append(job_dto)
-            
-            # Rate limiting
-            time.sleep(2)
+            try:
+                for page in range(1, pages + 1):
+                    if page > 1 and self.reached_target():
+                        break
+                    
+                    jobs = await self.fetch_jobs_page(page, query, category)
+                    
+                    if not jobs:
+                        break
+                    
+                    for job_data in jobs:
+                        job_id = str(job_data.get("id", ""))
+                        
+                        if job_id in self.seen_job_ids:
+                            continue
+                        
+                        self.seen_job_ids.add(job_id)
+                        job_dto = self.convert_to_job_dto(job_data)
+                        if job_dto:
+                            query_jobs.append(job_dto)
+                    
+                    # A short page is the last one; don't spend a request on the next
+                    if len(jobs) < RESULTS_PER_PAGE:
+                        break
+            except Exception as e:
+                logger.error(f"Error processing query '{query}': {e}")
         
-        # Save this query's jobs immediately
-        if query_jobs:
-            logger.info(f"Saving {len(query_jobs)} jobs for query '{query}'")
-            success_count, fail_count = ingestion_service.ingest_jobs_batch(query_jobs)
-            logger.info(f"Query '{query}': {success_count} saved, {fail_count} failed")
-            return success_count
+        return query, query_jobs
+    
+    def reached_target(self) -> bool:
+        """Whether saved plus buffered jobs already cover TARGET_JOB_COUNT"""
+        return self.total_saved + len(self.pending_jobs) >= TARGET_JOB_COUNT
+    
+    async def save_jobs(self, ingestion_service, jobs: List[JobDTO]):
+        """Save jobs in one ingestion batch, off the event loop so queries keep fetching"""
+        logger.info(f"Saving {len(jobs)} jobs")
+        success_count, fail_count = await asyncio.to_thread(ingestion_service.ingest_jobs_batch, jobs)
+        logger.info(f"Batch: {success_count} saved, {fail_count} failed")
         
-        return 0
+        self.total_saved += success_count
+        logger.info(f"Running total: {self.total_saved} jobs saved")
     
-    def fetch_diverse_jobs_incremental(self) -> int:
+    async def fetch_diverse_jobs_incremental(self) -> int:
         """Fetch diverse jobs with incremental saving"""
-        total_saved = 0
-        
-        # Comprehensive job queries across different industries
-        diverse_queries = [
-            # Tech jobs (reduced scope)
-            {"query": "software engineer", "category": "it-jobs", "pages": 2},
-            {"query": "data analyst", "category": "it-jobs", "pages": 2},
-            {"query": "web developer", "category": "it-jobs", "pages": 2},
-            
-            # Healthcare
-            {"query": "nurse", "category": "healthcare-nursing-jobs", "pages": 3},
-            {"query": "doctor", "category": "healthcare-nursing-jobs", "pages": 2},
-            {"query": "medical assistant", "category": "healthcare-nursing-jobs", "pages": 2},
-            {"query": "pharmacist", "category": "healthcare-nursing-jobs", "pages": 2},
-            
-            # Education
-            {"query": "teacher", "category": "teaching-jobs", "pages": 3},
-            {"query": "professor", "category": "teaching-jobs", "pages": 2},
-            {"query": "tutor", "category": "teaching-jobs", "pages": 2},
-            
-            # Business & Finance
-            {"query": "accountant", "category": "accounting-finance-jobs", "pages": 3},
-            {"query": "financial analyst", "category": "accounting-finance-jobs", "pages": 2},
-            {"query": "business analyst", "category": "accounting-finance-jobs", "pages": 2},
-            {"query": "project manager", "category": "accounting-finance-jobs", "pages": 2},
-            
-            # Sales & Marketing
-            {"query": "sales representative", "category": "sales-jobs", "pages": 3},
-            {"query": "marketing manager", "category": "pr-advertising-marketing-jobs", "pages": 2},
-            {"query": "digital marketing", "category": "pr-advertising-marketing-jobs", "pages": 2},
-            
-            # Engineering (non-software)
-            {"query": "mechanical engineer", "category": "engineering-jobs", "pages": 2},
-            {"query": "civil engineer", "category": "engineering-jobs", "pages": 2},
-            {"query": "electrical engineer", "category": "engineering-jobs", "pages": 2},
-            
-            # Customer Service & Retail
-            {"query": "customer service", "category": "customer-services-jobs", "pages": 2},
-            {"query": "retail manager", "category": "retail-jobs", "pages": 2},
-            
-            # HR & Legal
-            {"query": "hr manager", "category": "hr-jobs", "pages": 2},
-            {"query": "lawyer", "category": "legal-jobs", "pages": 2},
-            
-            # Hospitality
-            {"query": "hotel manager", "category": "hospitality-catering-jobs", "pages": 2},
-            {"query": "chef", "category": "hospitality-catering-jobs", "pages": 2},
-            
-            # Admin & Operations
-            {"query": "administrative assistant", "category": "admin-jobs", "pages": 2},
-            {"query": "operations manager", "category": "logistics-warehouse-jobs", "pages": 2},
-        ]
-        
         db = SessionLocal()
         
         try:
             # Clear existing adzuna_diverse jobs first
             from src.models.job import JobPosting
             
+            # One DELETE; its rowcount replaces a separate COUNT. The
+            # uq_source_external_id index leads with source, so both find
+            # the rows without a sequential scan.
             logger.info("Clearing existing adzuna_diverse jobs...")
             existing_count = db.query(JobPosting).filter(
                 JobPosting.source == "adzuna_diverse"
-            ).count()
-            
-            db.query(JobPosting).filter(
-                JobPosting.source == "adzuna_diverse"
             ).delete()
             db.commit()
             
             logger.info(f"Cleared {existing_count} existing adzuna_diverse jobs")
             
-            # Create ingestion service
+            # Queries are fetched concurrently; this loop is the single
+            # writer, saving jobs as their queries complete
             ingestion_service = JobIngestionService(db)
-            
-            # Process each query and save incrementally
-            total_queries = len(diverse_queries)
-            
-            for idx, job_search in enumerate(diverse_queries, 1):
-                query = job_search["query"]
-                category = job_search.get("category")
-                max_pages = job_search.get("pages", self.max_pages)
-                
-                logger.info(f"[{idx}/{total_queries}] Processing '{query}'")
-                
-                try:
-                    saved_count = self.fetch_and_save_query_jobs(
-                        query, category, max_pages, db, ingestion_service
-                    )
-                    total_saved += saved_count
-                    
-                    logger.info(f"Running total: {total_saved} jobs saved")
-                    
-                    # Break if we have enough jobs
-                    if total_saved >= 1500:
-                        logger.info(f"Reached target of 1500 jobs. Stopping.")
-                        break
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+            fetches = [
+                asyncio.create_task(self.fetch_query_jobs(semaphore, query, category, pages))
+                for query, category, pages in DIVERSE_SEARCHES
+            ]
+            
+            try:
+                for fetch in asyncio.as_completed(fetches):
+                    query, query_jobs = await fetch
+                    if not query_jobs:
+                        continue
                     
-                    # Pause between queries
-                    time.sleep(3)
+                    self.extract_skills_for_jobs(query_jobs)
+                    logger.info(f"Query '{query}': {len(query_jobs)} jobs fetched")
                     
-                except Exception as e:
-                    logger.error(f"Error processing query '{query}': {e}")
-                    continue
+                    # Save several queries' jobs per commit
+                    self.pending_jobs.extend(query_jobs)
+                    if len(self.pending_jobs) >= SAVE_BATCH_SIZE:
+                        await self.save_jobs(ingestion_service, self.pending_jobs)
+                        self.pending_jobs = []
+                
+                if self.pending_jobs:
+                    await self.save_jobs(ingestion_service, self.pending_jobs)
+                    self.pending_jobs = []
+            finally:
+                for fetch in fetches:
+                    fetch.cancel()
+            
+            if self.total_saved >= TARGET_JOB_COUNT:
+                logger.info(f"Reached target of {TARGET_JOB_COUNT} jobs. Stopped starting new queries.")
             
-            logger.info(f"Incremental job fetching complete! Total saved: {total_saved}")
+            logger.info(f"Incremental job fetching complete! Total saved: {self.total_saved}")
             
         except Exception as e:
             logger.error(f"Database error: {e}")
@@ -313,9 +363,9 @@ class AdzunaBatchFetcher:
         finally:
             db.close()
         
-        return total_saved
+        return self.total_saved
 
-def main():
+async def main():
     """Main function to fetch diverse Adzuna jobs with incremental saving"""
     try:
         from dotenv import load_dotenv
@@ -324,7 +374,10 @@ def main():
         fetcher = AdzunaBatchFetcher()
         
         logger.info("Starting diverse Adzuna job ingestion with incremental saves...")
-        total_saved = fetcher.fetch_diverse_jobs_incremental()
+        try:
+            total_saved = await fetcher.fetch_diverse_jobs_incremental()
+        finally:
+            await fetcher.close()
         
         if total_saved == 0:
             logger.warning("No jobs were saved from Adzuna API")
@@ -364,4 +417,4 @@ def main():
         logger.error(f"Error in diverse Adzuna integration: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -5,23 +5,179 @@ Fetch jobs from various industries, not just tech
 """
 import os
 import sys
-import json
+import orjson
 import logging
-import time
+import asyncio
+from collections import Counter, namedtuple
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
-import requests
+import httpx
+from sqlalchemy import text
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.db.database import SessionLocal
 from src.schemas.ingestion import JobDTO
 from src.services.job_ingestion import JobIngestionService
+from src.utils.keyword_matcher import KeywordMatcher
+from src.utils.rate_limiter import ADZUNA_REQUESTS_PER_MINUTE, AsyncTokenBucket, get_with_retries
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Queries run concurrently but share one ADZUNA_REQUESTS_PER_MINUTE bucket
+MAX_CONCURRENT_QUERIES = 5
+
+# Throttled or failed responses are retried, after Retry-After when given
+# and with exponential backoff otherwise
+RETRY_STATUSES = (429, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5
+
+# Stop starting new queries once this many jobs have been fetched
+TARGET_JOB_COUNT = 2000
+
+QuerySpec = namedtuple("QuerySpec", "query category pages")
+
+# Diverse job queries across different industries
+DIVERSE_QUERIES = (
+    # Tech jobs (keep some for balance)
+    QuerySpec("software engineer", "it-jobs", 2),
+    QuerySpec("data analyst", "it-jobs", 2),
+    
+    # Healthcare
+    QuerySpec("nurse", "healthcare-nursing-jobs", 3),
+    QuerySpec("doctor", "healthcare-nursing-jobs", 2),
+    QuerySpec("medical assistant", "healthcare-nursing-jobs", 2),
+    QuerySpec("pharmacist", "healthcare-nursing-jobs", 2),
+    
+    # Education
+    QuerySpec("teacher", "teaching-jobs", 3),
+    QuerySpec("professor", "teaching-jobs", 2),
+    QuerySpec("tutor", "teaching-jobs", 2),
+    
+    # Business & Finance
+    QuerySpec("accountant", "accounting-finance-jobs", 3),
+    QuerySpec("financial analyst", "accounting-finance-jobs", 2),
+    QuerySpec("business analyst", "accounting-finance-jobs", 2),
+    QuerySpec("project manager", "accounting-finance-jobs", 2),
+    
+    # Sales & Marketing
+    QuerySpec("sales representative", "sales-jobs", 3),
+    QuerySpec("marketing manager", "pr-advertising-marketing-jobs", 2),
+    QuerySpec("digital marketing", "pr-advertising-marketing-jobs", 2),
+    
+    # Engineering (non-software)
+    QuerySpec("mechanical engineer", "engineering-jobs", 2),
+    QuerySpec("civil engineer", "engineering-jobs", 2),
+    QuerySpec("electrical engineer", "engineering-jobs", 2),
+    
+    # Creative & Design
+    QuerySpec("graphic designer", "creative-design-jobs", 2),
+    QuerySpec("ui designer", "creative-design-jobs", 2),
+    QuerySpec("content writer", "creative-design-jobs", 2),
+    
+    # Customer Service & Retail
+    QuerySpec("customer service", "customer-services-jobs", 3),
+    QuerySpec("retail manager", "retail-jobs", 2),
+    QuerySpec("store manager", "retail-jobs", 2),
+    
+    # HR & Recruitment
+    QuerySpec("hr manager", "hr-jobs", 2),
+    QuerySpec("recruiter", "hr-jobs", 2),
+    QuerySpec("talent acquisition", "hr-jobs", 2),
+    
+    # Legal
+    QuerySpec("lawyer", "legal-jobs", 2),
+    QuerySpec("paralegal", "legal-jobs", 2),
+    QuerySpec("legal assistant", "legal-jobs", 2),
+    
+    # Hospitality & Tourism
+    QuerySpec("hotel manager", "hospitality-catering-jobs", 2),
+    QuerySpec("chef", "hospitality-catering-jobs", 2),
+    QuerySpec("restaurant manager", "hospitality-catering-jobs", 2),
+    
+    # Manufacturing & Logistics
+    QuerySpec("operations manager", "logistics-warehouse-jobs", 2),
+    QuerySpec("supply chain", "logistics-warehouse-jobs", 2),
+    QuerySpec("warehouse manager", "logistics-warehouse-jobs", 2),
+    
+    # Scientific Research
+    QuerySpec("research scientist", "scientific-qa-jobs", 2),
+    QuerySpec("lab technician", "scientific-qa-jobs", 2),
+    QuerySpec("quality assurance", "scientific-qa-jobs", 2),
+    
+    # Admin & Office
+    QuerySpec("administrative assistant", "admin-jobs", 2),
+    QuerySpec("office manager", "admin-jobs", 2),
+    QuerySpec("executive assistant", "admin-jobs", 2),
+)
+
+# Tech skills (reduced list for diverse jobs)
+TECH_SKILLS = (
+    "python", "javascript", "java", "sql", "excel", "powerpoint", "word",
+    "data analysis", "analytics", "reporting", "dashboard", "visualization"
+)
+
+# Professional skills across industries
+PROFESSIONAL_SKILLS = (
+    # Healthcare
+    "patient care", "medical records", "hipaa", "clinical", "diagnosis",
+    "pharmacy", "nursing", "emergency care", "medical billing",
+    
+    # Education
+    "curriculum", "lesson planning", "classroom management", "assessment",
+    "student engagement", "educational technology", "grading",
+    
+    # Business
+    "project management", "budgeting", "forecasting", "financial analysis",
+    "accounting", "quickbooks", "sap", "oracle", "salesforce",
+    
+    # Sales & Marketing
+    "lead generation", "crm", "cold calling", "negotiation", "closing",
+    "social media", "seo", "content marketing", "google ads", "analytics",
+    
+    # Customer Service
+    "customer support", "conflict resolution", "communication", "problem solving",
+    "multitasking", "phone skills", "email support", "ticketing",
+    
+    # HR
+    "recruitment", "onboarding", "performance management", "payroll",
+    "employee relations", "training", "compliance", "benefits",
+    
+    # Legal
+    "legal research", "litigation", "contracts", "compliance", "regulations",
+    "legal writing", "case management", "paralegal", "documentation",
+    
+    # General Professional
+    "leadership", "teamwork", "communication", "organization", "planning",
+    "time management", "attention to detail", "critical thinking",
+    "problem solving", "decision making", "adaptability", "creativity"
+)
+
+# One automaton scans a job once for every skill above; whole words only,
+# so "java" doesn't match inside "javascript". Skills listed in both groups
+# collapse into one entry.
+SKILL_MATCHER = KeywordMatcher(
+    {skill: [skill] for skill in TECH_SKILLS + PROFESSIONAL_SKILLS}, whole_words=True
+)
+
+
+# Jobs per ingest_jobs_batch call, which commits once per call
+INGEST_BATCH_SIZE = 250
+
+# Adzuna fields kept in raw_data; everything else is already stored in columns
+RAW_DATA_FIELDS = ("redirect_url", "adref", "category")
+
+
+@lru_cache(maxsize=4096)
+def parse_created(created: str) -> datetime:
+    """Parse an Adzuna created timestamp; the same values recur across pages and queries"""
+    return datetime.fromisoformat(created)
+
+
 class AdzunaDiverseFetcher:
     """Fetch diverse jobs from Adzuna API across multiple industries"""
     
@@ -32,7 +188,23 @@ class AdzunaDiverseFetcher:
         self.country = "us"
         self.max_pages = 5  # 5 × 50 = 250 results per query
         
-    def fetch_jobs_page(self, page: int, query: str = "", category: str = None) -> List[Dict]:
+        # One pooled client reuses keep-alive connections for every page;
+        # the transport retries failed connection attempts
+        self.client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(
+                    max_connections=MAX_CONCURRENT_QUERIES,
+                    max_keepalive_connections=MAX_CONCURRENT_QUERIES,
+                ),
+                retries=MAX_RETRIES,
+            ),
+            timeout=30,
+        )
+        self.rate_limiter = AsyncTokenBucket(ADZUNA_REQUESTS_PER_MINUTE, per=60, capacity=1)
+        # Jobs seen by any query this run; its size is the unique job count
+        self.seen_job_ids = set()
+        
+    async def fetch_jobs_page(self, page: int, query: str = "", category: str = None) -> List[Dict]:
         """Fetch a single page of jobs from Adzuna API"""
         url = f"{self.base_url}/jobs/{self.country}/search/{page}"
         
@@ -50,141 +222,73 @@ class AdzunaDiverseFetcher:
             params["category"] = category
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = await get_with_retries(
+                self.client, self.rate_limiter, url, params,
+                retry_statuses=RETRY_STATUSES, max_retries=MAX_RETRIES, base_delay=RETRY_BASE_DELAY,
+            )
+            
             response.raise_for_status()
             
-            data = response.json()
+            data = orjson.loads(response.content)
             jobs = data.get("results", [])
             
             logger.info(f"Fetched {len(jobs)} jobs from page {page} (query: '{query}', category: '{category}')")
             return jobs
             
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error fetching page {page}: {e}")
             return []
     
-    def fetch_diverse_jobs(self) -> List[JobDTO]:
-        """Fetch jobs from diverse categories"""
-        all_jobs = []
-        seen_job_ids = set()
-        
-        # Diverse job queries across different industries
-        diverse_queries = [
-            # Tech jobs (keep some for balance)
-            {"query": "software engineer", "category": "it-jobs", "pages": 2},
-            {"query": "data analyst", "category": "it-jobs", "pages": 2},
-            
-            # Healthcare
-            {"query": "nurse", "category": "healthcare-nursing-jobs", "pages": 3},
-            {"query": "doctor", "category": "healthcare-nursing-jobs", "pages": 2},
-            {"query": "medical assistant", "category": "healthcare-nursing-jobs", "pages": 2},
-            {"query": "pharmacist", "category": "healthcare-nursing-jobs", "pages": 2},
-            
-            # Education
-            {"query": "teacher", "category": "teaching-jobs", "pages": 3},
-            {"query": "professor", "category": "teaching-jobs", "pages": 2},
-            {"query": "tutor", "category": "teaching-jobs", "pages": 2},
-            
-            # Business & Finance
-            {"query": "accountant", "category": "accounting-finance-jobs", "pages": 3},
-            {"query": "financial analyst", "category": "accounting-finance-jobs", "pages": 2},
-            {"query": "business analyst", "category": "accounting-finance-jobs", "pages": 2},
-            {"query": "project manager", "category": "accounting-finance-jobs", "pages": 2},
-            
-            # Sales & Marketing
-            {"query": "sales representative", "category": "sales-jobs", "pages": 3},
-            {"query": "marketing manager", "category": "pr-advertising-marketing-jobs", "pages": 2},
-            {"query": "digital marketing", "category": "pr-advertising-marketing-jobs", "pages": 2},
-            
-            # Engineering (non-software)
-            {"query": "mechanical engineer", "category": "engineering-jobs", "pages": 2},
-            {"query": "civil engineer", "category": "engineering-jobs", "pages": 2},
-            {"query": "electrical engineer", "category": "engineering-jobs", "pages": 2},
-            
-            # Creative & Design
-            {"query": "graphic designer", "category": "creative-design-jobs", "pages": 2},
-            {"query": "ui designer", "category": "creative-design-jobs", "pages": 2},
-            {"query": "content writer", "category": "creative-design-jobs", "pages": 2},
-            
-            # Customer Service & Retail
-            {"query": "customer service", "category": "customer-services-jobs", "pages": 3},
-            {"query": "retail manager", "category": "retail-jobs", "pages": 2},
-            {"query": "store manager", "category": "retail-jobs", "pages": 2},
-            
-            # HR & Recruitment
-            {"query": "hr manager", "category": "hr-jobs", "pages": 2},
-            {"query": "recruiter", "category": "hr-jobs", "pages": 2},
-            {"query": "talent acquisition", "category": "hr-jobs", "pages": 2},
-            
-            # Legal
-            {"query": "lawyer", "category": "legal-jobs", "pages": 2},
-            {"query": "paralegal", "category": "legal-jobs", "pages": 2},
-            {"query": "legal assistant", "category": "legal-jobs", "pages": 2},
-            
-            # Hospitality & Tourism
-            {"query": "hotel manager", "category": "hospitality-catering-jobs", "pages": 2},
-            {"query": "chef", "category": "hospitality-catering-jobs", "pages": 2},
-            {"query": "restaurant manager", "category": "hospitality-catering-jobs", "pages": 2},
-            
-            # Manufacturing & Logistics
-            {"query": "operations manager", "category": "logistics-warehouse-jobs", "pages": 2},
-            {"query": "supply chain", "category": "logistics-warehouse-jobs", "pages": 2},
-            {"query": "warehouse manager", "category": "logistics-warehouse-jobs", "pages": 2},
-            
-            # Scientific Research
-            {"query": "research scientist", "category": "scientific-qa-jobs", "pages": 2},
-            {"query": "lab technician", "category": "scientific-qa-jobs", "pages": 2},
-            {"query": "quality assurance", "category": "scientific-qa-jobs", "pages": 2},
-            
-            # Admin & Office
-            {"query": "administrative assistant", "category": "admin-jobs", "pages": 2},
-            {"query": "office manager", "category": "admin-jobs", "pages": 2},
-            {"query": "executive assistant", "category": "admin-jobs", "pages": 2},
-        ]
+    async def fetch_query_pages(self, semaphore: asyncio.Semaphore, query: str,
+                                category: str, pages: int) -> List[JobDTO]:
+        """Fetch one query's pages in order, keeping only jobs not yet seen this run"""
+        query_results = []
         
-        total_queries = len(diverse_queries)
-        
-        for idx, job_search in enumerate(diverse_queries, 1):
-            query = job_search["query"]
-            category = job_search.get("category")
-            max_pages = job_search.get("pages", self.max_pages)
+        async with semaphore:
+            if len(self.seen_job_ids) >= TARGET_JOB_COUNT:
+                return query_results
             
-            logger.info(f"[{idx}/{total_queries}] Fetching '{query}' in category '{category}'")
-            query_job_count = 0
+            logger.info(f"Fetching '{query}' in category '{category}'")
             
-            for page in range(1, max_pages + 1):
-                jobs = self.fetch_jobs_page(page, query, category)
+            for page in range(1, pages + 1):
+                jobs = await self.fetch_jobs_page(page, query, category)
                 
                 if not jobs:
                     break
                 
-                for job_data in jobs:
-                    job_id = str(job_data.get("id", ""))
-                    
-                    if job_id in seen_job_ids:
-                        continue
-                    
-                    seen_job_ids.add(job_id)
-                    job_dto = self.convert_to_job_dto(job_data)
-                    if job_dto:
-                        all_jobs.append(job_dto)
-                        query_job_count += 1
-                
-                # Rate limiting
-                time.sleep(2.5)
-            
-            logger.info(f"Query '{query}' yielded {query_job_count} unique jobs. Total: {len(all_jobs)}")
-            
-            # Stop if we have enough jobs
-            if len(all_jobs) >= 2000:
-                logger.info(f"Reached target of 2000 jobs. Stopping.")
-                break
-            
-            time.sleep(3)
+                # Convert off the event loop so other queries keep fetching meanwhile
+                for job_dto in await asyncio.to_thread(self.convert_page, jobs):
+                    if job_dto.external_id not in self.seen_job_ids:
+                        self.seen_job_ids.add(job_dto.external_id)
+                        query_results.append(job_dto)
+        
+        return query_results
+    
+    async def fetch_diverse_jobs(self) -> List[JobDTO]:
+        """Fetch jobs from diverse categories"""
+        all_jobs = []
+        
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        results = await asyncio.gather(*[
+            self.fetch_query_pages(semaphore, spec.query, spec.category, spec.pages)
+            for spec in DIVERSE_QUERIES
+        ])
+        
+        for spec, query_results in zip(DIVERSE_QUERIES, results):
+            all_jobs.extend(query_results)
+            logger.info(f"Query '{spec.query}' yielded {len(query_results)} unique jobs. Total: {len(all_jobs)}")
         
         logger.info(f"Total unique jobs fetched: {len(all_jobs)}")
         return all_jobs
     
+    async def close(self):
+        """Close the HTTP client"""
+        await self.client.aclose()
+    
+    def convert_page(self, jobs: List[Dict]) -> List[JobDTO]:
+        """Convert a page of Adzuna results, dropping any that fail to convert"""
+        return [job_dto for job_data in jobs if (job_dto := self.convert_to_job_dto(job_data))]
+    
     def convert_to_job_dto(self, job_data: Dict) -> Optional[JobDTO]:
         """Convert Adzuna job data to JobDTO"""
         try:
@@ -212,14 +316,20 @@ class AdzunaDiverseFetcher:
             posted_date = None
             if job_data.get("created"):
                 try:
-                    posted_date = datetime.fromisoformat(job_data["created"].replace('Z', '+00:00'))
-                except:
+                    posted_date = parse_created(job_data["created"])
+                except (TypeError, ValueError):
                     posted_date = datetime.now()
             
-            # Extract skills (both tech and non-tech)
-            extracted_skills = self.extract_skills_from_job(title, description)
+            # Extract category label (or tag), trimmed to the column size
+            category = job_data.get("category")
+            if isinstance(category, dict):
+                category = category.get("label") or category.get("tag")
+            elif not isinstance(category, str):
+                category = None
+            if category:
+                category = str(category).strip()[:100]
             
-            return JobDTO(
+            job_dto = JobDTO(
                 external_id=f"adzuna_{job_id}",
                 source="adzuna_diverse",
                 title=title,
@@ -229,80 +339,26 @@ class AdzunaDiverseFetcher:
                 salary_min=salary_min,
                 salary_max=salary_max,
                 job_type="Full-time",
+                category=category,
                 posted_date=posted_date,
-                extracted_skills=extracted_skills,
-                raw_data=job_data
+                raw_data={key: job_data[key] for key in RAW_DATA_FIELDS if key in job_data}
             )
             
+            # Extract skills (both tech and non-tech) from the DTO's cached
+            # lowercased title and description
+            job_dto.extracted_skills = self.extract_skills_from_job(job_dto.search_text)
+            return job_dto
+            
         except Exception as e:
             logger.error(f"Error converting job data: {e}")
             return None
     
-    def extract_skills_from_job(self, title: str, description: str) -> List[str]:
-        """Extract skills from job title and description"""
-        skills = []
-        text = f"{title} {description}".lower()
-        
-        # Tech skills (reduced list for diverse jobs)
-        tech_skills = [
-            "python", "javascript", "java", "sql", "excel", "powerpoint", "word",
-            "data analysis", "analytics", "reporting", "dashboard", "visualization"
-        ]
-        
-        # Professional skills across industries
-        professional_skills = [
-            # Healthcare
-            "patient care", "medical records", "hipaa", "clinical", "diagnosis",
-            "pharmacy", "nursing", "emergency care", "medical billing",
-            
-            # Education
-            "curriculum", "lesson planning", "classroom management", "assessment",
-            "student engagement", "educational technology", "grading",
-            
-            # Business
-            "project management", "budgeting", "forecasting", "financial analysis",
-            "accounting", "quickbooks", "sap", "oracle", "salesforce",
-            
-            # Sales & Marketing
-            "lead generation", "crm", "cold calling", "negotiation", "closing",
-            "social media", "seo", "content marketing", "google ads", "analytics",
-            
-            # Customer Service
-            "customer support", "conflict resolution", "communication", "problem solving",
-            "multitasking", "phone skills", "email support", "ticketing",
-            
-            # HR
-            "recruitment", "onboarding", "performance management", "payroll",
-            "employee relations", "training", "compliance", "benefits",
-            
-            # Legal
-            "legal research", "litigation", "contracts", "compliance", "regulations",
-            "legal writing", "case management", "paralegal", "documentation",
-            
-            # General Professional
-            "leadership", "teamwork", "communication", "organization", "planning",
-            "time management", "attention to detail", "critical thinking",
-            "problem solving", "decision making", "adaptability", "creativity"
-        ]
-        
-        # Check for skills
-        all_skills = tech_skills + professional_skills
-        for skill in all_skills:
-            if skill in text:
-                skills.append(skill.title())
-        
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_skills = []
-        for skill in skills:
-            if skill not in seen:
-                seen.add(skill)
-                unique_skills.append(skill)
-        
-        return unique_skills[:10]  # Limit to 10 skills per job
+    def extract_skills_from_job(self, text: str) -> List[str]:
+        """Extract skills from a job's lowercased title and description (JobDTO.search_text)"""
+        skills = [skill.title() for skill in SKILL_MATCHER.find_ordered(text)]
+        return skills[:10]  # Limit to 10 skills per job
 
-
-def main():
+async def main():
     """Main function to fetch diverse Adzuna jobs"""
     try:
         from dotenv import load_dotenv
@@ -311,7 +367,10 @@ def main():
         fetcher = AdzunaDiverseFetcher()
         
         logger.info("Starting diverse Adzuna job ingestion...")
-        jobs = fetcher.fetch_diverse_jobs()
+        try:
+            jobs = await fetcher.fetch_diverse_jobs()
+        finally:
+            await fetcher.close()
         
         if not jobs:
             logger.warning("No jobs fetched from Adzuna API")
@@ -325,14 +384,12 @@ def main():
         try:
             # Clear existing Adzuna diverse jobs
             from src.models.job import JobPosting
-            from src.models.skill import JobSkill
-            
-            existing_jobs = db.query(JobPosting).filter(
-                JobPosting.source == "adzuna_diverse"
-            ).all()
             
-            for job in existing_jobs:
-                db.query(JobSkill).filter(JobSkill.job_id == job.id).delete()
+            # Delete related job_skills first, in one statement
+            db.execute(text("""
+                DELETE FROM job_skills
+                WHERE job_id IN (SELECT id FROM job_postings WHERE source = :source)
+            """), {"source": "adzuna_diverse"})
             
             db.query(JobPosting).filter(
                 JobPosting.source == "adzuna_diverse"
@@ -341,22 +398,28 @@ def main():
             
             logger.info("Cleared existing diverse Adzuna jobs")
             
-            # Ingest new jobs
+            # Ingest new jobs in batches. ingest_jobs_batch owns the
+            # transaction and commits each batch itself, so a late failure
+            # only loses that batch
             ingestion_service = JobIngestionService(db)
-            success_count, fail_count = ingestion_service.ingest_jobs_batch(jobs)
+            success_count = fail_count = 0
+            for start in range(0, len(jobs), INGEST_BATCH_SIZE):
+                batch_success, batch_fail = ingestion_service.ingest_jobs_batch(
+                    jobs[start:start + INGEST_BATCH_SIZE]
+                )
+                success_count += batch_success
+                fail_count += batch_fail
+                logger.info(f"Loaded {success_count + fail_count}/{len(jobs)} jobs")
             
             logger.info(f"Diverse Adzuna job ingestion complete!")
             logger.info(f"Successfully loaded: {success_count}")
             logger.info(f"Failed: {fail_count}")
             
             # Show category breakdown
-            job_categories = {}
-            for job in jobs:
-                category = job.raw_data.get("category", {}).get("label", "Unknown")
-                job_categories[category] = job_categories.get(category, 0) + 1
+            job_categories = Counter(job.category or "Unknown" for job in jobs)
             
             logger.info("\nJobs by category:")
-            for category, count in sorted(job_categories.items(), key=lambda x: x[1], reverse=True):
+            for category, count in job_categories.most_common():
                 logger.info(f"  {category}: {count}")
             
             # Total jobs in database
@@ -374,4 +437,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
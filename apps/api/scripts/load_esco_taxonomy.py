@@ -80,24 +80,35 @@ def main():
             # Get default category
             default_category = loader.get_or_create_default_category()
             
-            for skill_name, skill_type, description in sample_skills:
-                from src.models.skill_mapping import SkillV2, SkillType
-                
-                # Check if skill already exists
-                existing = db.query(SkillV2).filter(SkillV2.name == skill_name).first()
-                if not existing:
-                    skill = SkillV2(
-                        name=skill_name,
-                        category_id=default_category.id,
-                        skill_type=SkillType(skill_type),
-                        description=description,
-                        is_canonical=True
-                    )
-                    db.add(skill)
-                    
-                    # Create embeddings if model available
-                    if loader.sbert_model:
-                        loader.create_skill_embedding(skill)
+            from src.models.skill_mapping import SkillV2, SkillType
+            
+            # Find which sample skills already exist in one query
+            existing_names = {
+                name for (name,) in db.query(SkillV2.name).filter(
+                    SkillV2.name.in_([skill_name for skill_name, _, _ in sample_skills])
+                )
+            }
+            
+            new_skills = [
+                SkillV2(
+                    name=skill_name,
+                    category_id=default_category.id,
+                    skill_type=SkillType(skill_type),
+                    description=description,
+                    is_canonical=True
+                )
+                for skill_name, skill_type, description in sample_skills
+                if skill_name not in existing_names
+            ]
+            
+            # One flush inserts them all as a multi-row INSERT and assigns ids
+            db.add_all(new_skills)
+            db.flush()
+            
+            # Create embeddings if model available
+            if loader.sbert_model:
+                for skill in new_skills:
+                    loader.create_skill_embedding(skill)
             
             db.commit()
             logger.info("✅ Created sample skills")
@@ -5,12 +5,13 @@ Load sample skills data for testing
 import sys
 import logging
 from pathlib import Path
+from typing import Sequence
 
 # Add the project root to the Python path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.db.database import SessionLocal
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 
 # Setup logging
 logging.basicConfig(
@@ -20,6 +21,30 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def upsert_by_id(db, table: str, columns: Sequence[str], rows: Sequence[Sequence]):
+    """Upsert rows keyed on id with one multi-row INSERT ... ON CONFLICT statement.
+
+    columns must start with "id"; every other column is overwritten on conflict.
+    """
+    values = ", ".join(
+        "(" + ", ".join(f":{column}_{i}" for column in columns) + ")"
+        for i in range(len(rows))
+    )
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in columns[1:])
+    params = {
+        f"{column}_{i}": value
+        for i, row in enumerate(rows)
+        for column, value in zip(columns, row)
+    }
+    
+    db.execute(text(f"""
+        INSERT INTO {table} ({", ".join(columns)})
+        VALUES {values}
+        ON CONFLICT (id) DO UPDATE SET
+        {updates}
+    """), params)
+
+
 def load_sample_skills():
     """Load sample skills data"""
     
@@ -43,22 +68,11 @@ def load_sample_skills():
             (9, "Soft Skills", None, 1),
         ]
         
-        for cat_id, name, parent_id, level in categories:
-            db.execute(text("""
-                INSERT INTO skill_categories_v2 (id, name, parent_id, level, description)
-                VALUES (:id, :name, :parent_id, :level, :description)
-                ON CONFLICT (id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    parent_id = EXCLUDED.parent_id,
-                    level = EXCLUDED.level,
-                    description = EXCLUDED.description
-            """), {
-                'id': cat_id,
-                'name': name,
-                'parent_id': parent_id,
-                'level': level,
-                'description': f"{name} related skills"
-            })
+        upsert_by_id(
+            db, "skill_categories_v2", ("id", "name", "parent_id", "level", "description"),
+            [(cat_id, name, parent_id, level, f"{name} related skills")
+             for cat_id, name, parent_id, level in categories]
+        )
         
         # Create skills
         logger.info("Creating skills...")
@@ -111,24 +125,10 @@ def load_sample_skills():
             (40, "Pharmacology", 5, "domain", "Drug knowledge and interactions"),
         ]
         
-        for skill_id, name, category_id, skill_type, description in skills:
-            db.execute(text("""
-                INSERT INTO skills_v2 (id, name, category_id, skill_type, description, is_canonical)
-                VALUES (:id, :name, :category_id, :skill_type, :description, :is_canonical)
-                ON CONFLICT (id) DO UPDATE SET
-                    name = EXCLUDED.name,
-                    category_id = EXCLUDED.category_id,
-                    skill_type = EXCLUDED.skill_type,
-                    description = EXCLUDED.description,
-                    is_canonical = EXCLUDED.is_canonical
-            """), {
-                'id': skill_id,
-                'name': name,
-                'category_id': category_id,
-                'skill_type': skill_type,
-                'description': description,
-                'is_canonical': True
-            })
+        upsert_by_id(
+            db, "skills_v2", ("id", "name", "category_id", "skill_type", "description", "is_canonical"),
+            [skill + (True,) for skill in skills]
+        )
         
         # Create aliases
         logger.info("Creating skill aliases...")
@@ -151,30 +151,19 @@ def load_sample_skills():
             (15, "Redis", "alternative", "MongoDB"),
         ]
         
-        for alias_id, alias, alias_type, skill_name in aliases:
-            # Find skill by name
-            skill = db.execute(text("""
-                SELECT id FROM skills_v2 WHERE name = :name
-            """), {'name': skill_name}).fetchone()
-            
-            if skill:
-                db.execute(text("""
-                    INSERT INTO skill_aliases (id, skill_id, alias, alias_type, source, is_approved)
-                    VALUES (:id, :skill_id, :alias, :alias_type, :source, :is_approved)
-                    ON CONFLICT (id) DO UPDATE SET
-                        skill_id = EXCLUDED.skill_id,
-                        alias = EXCLUDED.alias,
-                        alias_type = EXCLUDED.alias_type,
-                        source = EXCLUDED.source,
-                        is_approved = EXCLUDED.is_approved
-                """), {
-                    'id': alias_id,
-                    'skill_id': skill[0],
-                    'alias': alias,
-                    'alias_type': alias_type,
-                    'source': 'manual',
-                    'is_approved': True
-                })
+        # Look up every aliased skill's id in one query
+        skill_ids = dict(db.execute(
+            text("SELECT name, id FROM skills_v2 WHERE name IN :names")
+            .bindparams(bindparam("names", expanding=True)),
+            {'names': list({skill_name for _, _, _, skill_name in aliases})}
+        ).all())
+        
+        upsert_by_id(
+            db, "skill_aliases", ("id", "skill_id", "alias", "alias_type", "source", "is_approved"),
+            [(alias_id, skill_ids[skill_name], alias, alias_type, 'manual', True)
+             for alias_id, alias, alias_type, skill_name in aliases
+             if skill_name in skill_ids]
+        )
         
         # Reset sequences
         db.execute(text("SELECT setval('skill_categories_v2_id_seq', 10, true);"))
@@ -0,0 +1,37 @@
+"""Helpers for running batches of DDL statements"""
+from typing import Sequence
+
+
+def execute_statements(conn, statements: Sequence[str]):
+    """Run statements in order using as few server round trips as the driver allows.
+
+    psycopg 3 streams them through a pipeline, psycopg2 receives a single
+    ;-joined string and any other driver gets one execute per statement.
+    """
+    driver = conn.dialect.driver
+
+    if driver == "psycopg":
+        raw = conn.connection.driver_connection
+        with raw.pipeline(), raw.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+    elif driver == "psycopg2":
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(";\n".join(statements))
+        finally:
+            cursor.close()
+    else:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
+
+
+def create_indexes_concurrently(engine, statements: Sequence[str]):
+    """Run CREATE INDEX CONCURRENTLY statements one at a time on an autocommit connection.
+
+    CONCURRENTLY can't run inside a transaction block, but in exchange the
+    build only takes a lock that lets writers keep going.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in statements:
+            conn.exec_driver_sql(statement)
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
@@ -23,6 +23,23 @@ class JobDTO(BaseModel):
     # Extracted skills will be processed separately
     extracted_skills: Optional[List[str]] = Field(default_factory=list)
     
+    _description_lower: Optional[str] = PrivateAttr(default=None)
+    _search_text: Optional[str] = PrivateAttr(default=None)
+    
+    @property
+    def description_lower(self) -> str:
+        """Lowercased description, computed once and shared by every skill matcher"""
+        if self._description_lower is None:
+            self._description_lower = self.description.lower()
+        return self._description_lower
+    
+    @property
+    def search_text(self) -> str:
+        """Lowercased title and description, computed once for matchers that scan both"""
+        if self._search_text is None:
+            self._search_text = f"{self.title} {self.description}".lower()
+        return self._search_text
+    
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat() if v else None
@@ -0,0 +1,80 @@
+"""
+Multi-pattern keyword matching for simple skill extraction
+"""
+import re
+from typing import Dict, Iterable, List, Set
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _is_whole_word(text: str, start: int, end: int) -> bool:
+    """Check that text[start:end] isn't part of a longer word"""
+    return (
+        (start == 0 or not _is_word_char(text[start - 1]))
+        and (end == len(text) or not _is_word_char(text[end]))
+    )
+
+
+class KeywordMatcher:
+    """Find which skills have at least one pattern occurring in a text.
+
+    Patterns are compiled once into an Aho-Corasick automaton so a text is
+    scanned in a single pass regardless of how many patterns there are.
+    Falls back to per-pattern checks (substring, or a precompiled regex for
+    whole words) when pyahocorasick isn't installed.
+    With whole_words=True a pattern only counts when it isn't part of a
+    longer word, so "java" doesn't match inside "javascript".
+    """
+
+    def __init__(self, skill_patterns: Dict[str, Iterable[str]], whole_words: bool = False):
+        self.skill_patterns = {skill: list(patterns) for skill, patterns in skill_patterns.items()}
+        self.whole_words = whole_words
+        self._automaton = None
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for skill, patterns in self.skill_patterns.items():
+                for pattern in patterns:
+                    _, skills = self._automaton.get(pattern, (len(pattern), set()))
+                    skills.add(skill)
+                    self._automaton.add_word(pattern, (len(pattern), skills))
+            self._automaton.make_automaton()
+        elif whole_words:
+            # Compile each pattern once with word-boundary lookarounds
+            self._word_regexes = {
+                pattern: re.compile(rf"(?<!\w){re.escape(pattern)}(?!\w)")
+                for patterns in self.skill_patterns.values()
+                for pattern in patterns
+            }
+
+    def _contains(self, text: str, pattern: str) -> bool:
+        if not self.whole_words:
+            return pattern in text
+        return self._word_regexes[pattern].search(text) is not None
+
+    def find(self, text: str) -> Set[str]:
+        """Return the skills with a pattern found anywhere in text"""
+        if self._automaton is None:
+            return {
+                skill for skill, patterns in self.skill_patterns.items()
+                if any(self._contains(text, pattern) for pattern in patterns)
+            }
+
+        found = set()
+        for end, (length, skills) in self._automaton.iter(text):
+            if self.whole_words and not _is_whole_word(text, end - length + 1, end + 1):
+                continue
+            found |= skills
+        return found
+
+    def find_ordered(self, text: str) -> List[str]:
+        """Return found skills in the order they were given to the matcher"""
+        found = self.find(text)
+        return [skill for skill in self.skill_patterns if skill in found]
@@ -0,0 +1,118 @@
+"""
+Async rate limiting for external API fetchers
+"""
+import asyncio
+import logging
+import time
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Adzuna allows 25 requests per minute. Fetchers share one bucket per run
+# with capacity=1, so requests are spaced evenly from the start, and fold
+# the X-RateLimit-* response headers in with observe_headers.
+ADZUNA_REQUESTS_PER_MINUTE = 25
+
+# X-RateLimit-Reset values above this are epoch timestamps, not delays
+RATE_LIMIT_EPOCH_THRESHOLD = 1_000_000_000
+
+
+def retry_delay(headers, attempt: int, base: float) -> float:
+    """Honour Retry-After when it's given in seconds, otherwise back off exponentially"""
+    try:
+        return float(headers["Retry-After"])
+    except (KeyError, ValueError):
+        return base * 2 ** attempt
+
+
+class AsyncTokenBucket:
+    """Allow at most `rate` acquisitions per `per` seconds across concurrent tasks.
+
+    Tokens refill continuously; `capacity` caps how many can be spent in a
+    burst. Waiters are served in turn since the lock is held while sleeping.
+    Quota reported by the server can be folded in with `observe`.
+    """
+
+    def __init__(self, rate: int, per: float = 60.0, capacity: int = None):
+        self.refill_rate = rate / per
+        self.capacity = capacity or rate
+        self._tokens = float(self.capacity)
+        self._updated = None
+        self._resume_at = None
+        self._lock = asyncio.Lock()
+
+    def observe(self, remaining: int, reset_in: float = None):
+        """Never hold more tokens than the server says remain.
+
+        Once the server reports nothing left, acquisitions wait until
+        `reset_in` seconds from now (or for the normal refill if unknown).
+        """
+        now = asyncio.get_running_loop().time()
+        if self._updated is None:
+            self._updated = now
+        self._tokens = min(self._tokens, float(remaining))
+        if remaining <= 0 and reset_in:
+            self._resume_at = now + reset_in
+
+    def observe_headers(self, headers) -> Optional[int]:
+        """Feed X-RateLimit-Remaining / X-RateLimit-Reset response headers into `observe`.
+
+        Returns the remaining quota, or None when the headers are missing
+        or malformed.
+        """
+        if "X-RateLimit-Remaining" not in headers:
+            return None
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_in = float(headers.get("X-RateLimit-Reset", 0))
+        except ValueError:
+            return None
+
+        # The reset header may be an epoch timestamp rather than a delay
+        if reset_in > RATE_LIMIT_EPOCH_THRESHOLD:
+            reset_in = max(0.0, reset_in - time.time())
+
+        self.observe(remaining, reset_in or None)
+        return remaining
+
+    async def acquire(self):
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_rate)
+            self._updated = now
+
+            if self._resume_at is not None:
+                if now < self._resume_at:
+                    await asyncio.sleep(self._resume_at - now)
+                    self._tokens = 1.0
+                    self._updated = loop.time()
+                self._resume_at = None
+
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.refill_rate)
+                self._tokens = 1.0
+                self._updated = loop.time()
+
+            self._tokens -= 1
+
+
+async def get_with_retries(client, bucket: AsyncTokenBucket, url: str, params: dict = None, *,
+                           retry_statuses: Iterable[int], max_retries: int, base_delay: float):
+    """GET url through the bucket, retrying responses with a status in retry_statuses.
+
+    Every response's rate-limit headers are fed back into the bucket. The
+    last response is returned as is, so callers still raise_for_status.
+    """
+    for attempt in range(max_retries + 1):
+        await bucket.acquire()
+        response = await client.get(url, params=params)
+        bucket.observe_headers(response.headers)
+
+        if response.status_code not in retry_statuses or attempt == max_retries:
+            return response
+
+        delay = retry_delay(response.headers, attempt, base_delay)
+        logger.warning(f"{url} returned {response.status_code}, retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
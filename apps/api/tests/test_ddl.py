@@ -0,0 +1,70 @@
+"""
+Test suite for the DDL batching helpers
+"""
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from db.ddl import execute_statements, create_indexes_concurrently
+
+
+STATEMENTS = ["CREATE TABLE a (id INT)", "CREATE TABLE b (id INT)"]
+
+
+def make_conn(driver):
+    """Connection mock reporting the given DBAPI driver name"""
+    conn = MagicMock()
+    conn.dialect.driver = driver
+    return conn
+
+
+class TestExecuteStatements:
+    """Test cases for execute_statements"""
+
+    def test_psycopg_uses_pipeline(self):
+        """psycopg 3 runs every statement on one cursor inside a pipeline"""
+        conn = make_conn("psycopg")
+        raw = conn.connection.driver_connection
+        cursor = raw.cursor.return_value.__enter__.return_value
+
+        execute_statements(conn, STATEMENTS)
+
+        raw.pipeline.assert_called_once()
+        assert [call.args[0] for call in cursor.execute.call_args_list] == STATEMENTS
+        conn.exec_driver_sql.assert_not_called()
+
+    def test_psycopg2_sends_one_joined_string(self):
+        """psycopg2 gets a single ;-joined execute and the cursor is closed"""
+        conn = make_conn("psycopg2")
+        cursor = conn.connection.cursor.return_value
+
+        execute_statements(conn, STATEMENTS)
+
+        cursor.execute.assert_called_once_with(";\n".join(STATEMENTS))
+        cursor.close.assert_called_once()
+
+    def test_other_drivers_execute_each_statement(self):
+        """Any other driver gets one exec_driver_sql per statement, in order"""
+        conn = make_conn("pymysql")
+
+        execute_statements(conn, STATEMENTS)
+
+        assert [call.args[0] for call in conn.exec_driver_sql.call_args_list] == STATEMENTS
+
+
+class TestCreateIndexesConcurrently:
+    """Test cases for create_indexes_concurrently"""
+
+    def test_runs_on_autocommit_connection(self):
+        """Statements run one at a time outside a transaction block"""
+        engine = MagicMock()
+        autocommit = engine.connect.return_value.execution_options.return_value
+        conn = autocommit.__enter__.return_value
+
+        create_indexes_concurrently(engine, STATEMENTS)
+
+        engine.connect.return_value.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+        assert [call.args[0] for call in conn.exec_driver_sql.call_args_list] == STATEMENTS
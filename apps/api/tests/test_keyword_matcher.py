@@ -0,0 +1,100 @@
+"""
+Test suite for the multi-pattern keyword matcher
+"""
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils import keyword_matcher
+from utils.keyword_matcher import KeywordMatcher
+
+
+SKILLS = {
+    "java": ["java"],
+    "javascript": ["javascript", "js"],
+    ".net": [".net"],
+    "asp.net": ["asp.net"],
+    "c++": ["c++"],
+    "machine learning": ["machine learning", "ml"],
+}
+
+TEXTS = [
+    "senior javascript developer",
+    "java and javascript",
+    "experience with asp.net mvc",
+    "strong .net background",
+    "modern c++ and c++17",
+    "c++, python",
+    "html/css, no js frameworks",
+    "machine learning (ml) engineer",
+    "xml parsing",
+    "",
+]
+
+
+def build_matcher(whole_words, use_automaton):
+    """Build a matcher on the automaton or, with pyahocorasick hidden, the fallback"""
+    if use_automaton:
+        if keyword_matcher.ahocorasick is None:
+            pytest.skip("pyahocorasick not installed")
+        return KeywordMatcher(SKILLS, whole_words=whole_words)
+
+    with patch.object(keyword_matcher, "ahocorasick", None):
+        return KeywordMatcher(SKILLS, whole_words=whole_words)
+
+
+@pytest.mark.parametrize("use_automaton", [True, False], ids=["automaton", "fallback"])
+class TestKeywordMatcher:
+    """Test cases for KeywordMatcher, run on both matching paths"""
+
+    def test_substring_matching(self, use_automaton):
+        """Without whole_words, patterns match inside longer words"""
+        matcher = build_matcher(False, use_automaton)
+
+        assert matcher.find("javascript developer") == {"java", "javascript"}
+        assert matcher.find("asp.net mvc") == {"asp.net", ".net"}
+
+    def test_whole_word_excludes_longer_words(self, use_automaton):
+        """With whole_words, "java" doesn't match inside "javascript" """
+        matcher = build_matcher(True, use_automaton)
+
+        assert matcher.find("senior javascript developer") == {"javascript"}
+        assert matcher.find("java and javascript") == {"java", "javascript"}
+        assert matcher.find("xml parsing") == set()
+
+    def test_whole_word_dotted_patterns(self, use_automaton):
+        """".net" only matches when it isn't the tail of "asp.net" """
+        matcher = build_matcher(True, use_automaton)
+
+        assert matcher.find("experience with asp.net mvc") == {"asp.net"}
+        assert matcher.find("strong .net background") == {".net"}
+
+    def test_whole_word_symbol_patterns(self, use_automaton):
+        """Patterns ending in symbols still need a boundary after them"""
+        matcher = build_matcher(True, use_automaton)
+
+        assert matcher.find("c++, python") == {"c++"}
+        assert matcher.find("c++17 only") == set()
+
+    def test_find_ordered_follows_declaration_order(self, use_automaton):
+        """find_ordered lists each skill once, in the order given to the matcher"""
+        matcher = build_matcher(True, use_automaton)
+
+        assert matcher.find_ordered("ml, c++, js and java, more ml") == [
+            "java", "javascript", "c++", "machine learning"
+        ]
+
+
+@pytest.mark.parametrize("whole_words", [True, False])
+def test_automaton_and_fallback_agree(whole_words):
+    """Both matching paths find the same skills for every text"""
+    automaton = build_matcher(whole_words, True)
+    fallback = build_matcher(whole_words, False)
+
+    for text in TEXTS:
+        assert automaton.find(text) == fallback.find(text), text
@@ -0,0 +1,167 @@
+"""
+Test suite for the async token bucket rate limiter
+"""
+import sys
+import os
+import asyncio
+import time
+from unittest.mock import AsyncMock, Mock
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.rate_limiter import AsyncTokenBucket, get_with_retries, retry_delay
+
+
+async def acquire_times(bucket, count):
+    """Acquire count tokens and return how long after the start each one was granted"""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    times = []
+    for _ in range(count):
+        await bucket.acquire()
+        times.append(loop.time() - start)
+    return times
+
+
+class TestAsyncTokenBucket:
+    """Test cases for AsyncTokenBucket"""
+
+    def test_burst_up_to_capacity(self):
+        """A full bucket grants capacity tokens without waiting"""
+        bucket = AsyncTokenBucket(3, per=1.0)
+
+        times = asyncio.run(acquire_times(bucket, 3))
+
+        assert times[-1] < 0.05
+
+    def test_paces_after_capacity(self):
+        """With capacity=1, acquisitions are spaced by per / rate"""
+        bucket = AsyncTokenBucket(20, per=1.0, capacity=1)
+
+        times = asyncio.run(acquire_times(bucket, 4))
+
+        # First token is immediate, then one every 50 ms
+        assert times[0] < 0.02
+        assert times[-1] >= 0.14
+
+    def test_concurrent_tasks_share_the_bucket(self):
+        """Tasks acquiring at once are still paced as a whole"""
+        bucket = AsyncTokenBucket(20, per=1.0, capacity=1)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(*[bucket.acquire() for _ in range(4)])
+            return loop.time() - start
+
+        assert asyncio.run(run()) >= 0.14
+
+    def test_observe_caps_tokens(self):
+        """Remaining quota reported by the server caps the burst"""
+        bucket = AsyncTokenBucket(20, per=1.0, capacity=10)
+
+        async def run():
+            bucket.observe(1)
+            return await acquire_times(bucket, 2)
+
+        times = asyncio.run(run())
+
+        assert times[0] < 0.02
+        assert times[1] >= 0.04
+
+    def test_observe_waits_for_reset(self):
+        """No remaining quota holds acquisitions until the reported reset"""
+        bucket = AsyncTokenBucket(1000, per=1.0)
+
+        async def run():
+            bucket.observe(0, reset_in=0.1)
+            return await acquire_times(bucket, 1)
+
+        times = asyncio.run(run())
+
+        assert times[0] >= 0.09
+
+    def test_observe_headers_reads_quota(self):
+        """X-RateLimit-Remaining is returned and caps the bucket"""
+        bucket = AsyncTokenBucket(20, per=1.0, capacity=10)
+
+        async def run():
+            remaining = bucket.observe_headers({"X-RateLimit-Remaining": "1"})
+            return remaining, await acquire_times(bucket, 2)
+
+        remaining, times = asyncio.run(run())
+
+        assert remaining == 1
+        assert times[1] >= 0.04
+
+    def test_observe_headers_accepts_epoch_reset(self):
+        """A reset given as an epoch timestamp is turned into a delay"""
+        bucket = AsyncTokenBucket(1000, per=1.0)
+
+        async def run():
+            bucket.observe_headers({
+                "X-RateLimit-Remaining": "0",
+                "X-RateLimit-Reset": str(time.time() + 0.1),
+            })
+            return await acquire_times(bucket, 1)
+
+        times = asyncio.run(run())
+
+        assert 0.05 <= times[0] < 1
+
+    def test_observe_headers_ignores_missing_or_malformed(self):
+        """Missing or non-numeric headers leave the bucket alone"""
+        bucket = AsyncTokenBucket(3, per=1.0)
+
+        async def run():
+            assert bucket.observe_headers({}) is None
+            assert bucket.observe_headers({"X-RateLimit-Remaining": "soon"}) is None
+            return await acquire_times(bucket, 3)
+
+        assert asyncio.run(run())[-1] < 0.05
+
+
+class TestRetries:
+    """Test cases for retry_delay and get_with_retries"""
+
+    def test_retry_delay_prefers_retry_after(self):
+        """Retry-After in seconds wins over the backoff"""
+        assert retry_delay({"Retry-After": "2"}, 3, 0.5) == 2.0
+
+    def test_retry_delay_backs_off_exponentially(self):
+        """Without a numeric Retry-After the delay doubles per attempt"""
+        assert retry_delay({}, 0, 0.5) == 0.5
+        assert retry_delay({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}, 2, 0.5) == 2.0
+
+    def test_get_with_retries_retries_listed_statuses(self):
+        """Retryable statuses are retried until a final response comes back"""
+        responses = [
+            Mock(status_code=429, headers={"Retry-After": "0"}),
+            Mock(status_code=200, headers={}),
+        ]
+        client = Mock()
+        client.get = AsyncMock(side_effect=responses)
+        bucket = AsyncTokenBucket(1000, per=1.0)
+
+        response = asyncio.run(get_with_retries(
+            client, bucket, "https://example.test", {"page": 1},
+            retry_statuses=(429,), max_retries=3, base_delay=0,
+        ))
+
+        assert response is responses[1]
+        assert client.get.await_count == 2
+
+    def test_get_with_retries_returns_last_response(self):
+        """After max_retries the last response is returned for the caller to raise"""
+        client = Mock()
+        client.get = AsyncMock(return_value=Mock(status_code=503, headers={}))
+        bucket = AsyncTokenBucket(1000, per=1.0)
+
+        response = asyncio.run(get_with_retries(
+            client, bucket, "https://example.test",
+            retry_statuses=(503,), max_retries=2, base_delay=0,
+        ))
+
+        assert response.status_code == 503
+        assert client.get.await_count == 3